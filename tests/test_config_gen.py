@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tools.fusion import config_gen
+from tools.fusion.config_gen import ConfigGenerator
+
+# Encoder tiers of ConfigGenerator.save, by the module names it checks
+ENCODERS = ("orjson", "ujson", "stdlib")
+
+
+class TestConfigGeneratorSave(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.gen = ConfigGenerator().set_sd(request_timeout_ms=5000)
+        # Non-ASCII and "/" are where the encoders' defaults differ
+        self.gen.add_interface("primary", "Wi-Fi Ünïcode/1", endpoints={
+            "sd_uc_v4": {"ip": "127.0.0.1", "port": 30490},
+            "svc_v6": {"ip": "::1", "proto": "tcp"},
+        }, sd={"endpoint_v4": "sd_uc_v4"})
+        self.gen.add_instance("app", unicast_bind={"primary": "sd_uc_v4"},
+                              providing={"svc": {"service_id": 0x1234, "offer_on": {"primary": "svc_v6"}}})
+
+    def save_with(self, encoder, pretty):
+        """Save through one encoder tier, hiding the faster ones; returns the bytes."""
+        if encoder != "stdlib" and getattr(config_gen, encoder) is None:
+            self.skipTest(f"{encoder} is not installed")
+        hidden = ENCODERS[:ENCODERS.index(encoder)]
+        patches = {name: None if name in hidden else getattr(config_gen, name) for name in ENCODERS[:2]}
+        path = os.path.join(self.tmp_dir, f"{encoder}_{pretty}.json")
+        with mock.patch.multiple(config_gen, **patches):
+            self.gen.save(path, pretty=pretty)
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_each_encoder_round_trips(self):
+        for encoder in ENCODERS:
+            for pretty in (False, True):
+                with self.subTest(encoder=encoder, pretty=pretty):
+                    data = self.save_with(encoder, pretty)
+                    self.assertEqual(json.loads(data.decode("utf-8")), self.gen.to_dict())
+                    self.assertEqual(b"\n" in data, pretty)
+
+    def test_encoders_write_identical_bytes(self):
+        for pretty in (False, True):
+            expected = self.save_with("stdlib", pretty)
+            self.assertIn("Ünïcode/1".encode("utf-8"), expected)
+            for encoder in ("orjson", "ujson"):
+                with self.subTest(encoder=encoder, pretty=pretty):
+                    self.assertEqual(self.save_with(encoder, pretty), expected)
+
+    def test_save_creates_parent_dirs_unless_told_not_to(self):
+        path = os.path.join(self.tmp_dir, "a", "b", "config.json")
+        self.assertEqual(self.gen.save(path), path)
+        self.assertTrue(os.path.isfile(path))
+        with self.assertRaises(FileNotFoundError):
+            self.gen.save(os.path.join(self.tmp_dir, "missing", "config.json"), ensure_dir=False)
+
+    def test_from_dict_wraps_config_by_reference(self):
+        config = self.gen.to_dict()
+        wrapped = ConfigGenerator.from_dict(config)
+        self.assertIs(wrapped.to_dict(), config)
+        # The builder API keeps working on a wrapped config
+        wrapped.add_instance("other", required={"svc": {"service_id": 0x1234}})
+        self.assertIn("other", config["instances"])
+        self.assertNotIn("sd", config["instances"]["other"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,13 +7,29 @@ be passed directly to SomeIpRuntime::offer_service().
 """
 from .base import AbstractGenerator
 from ..models import Struct, Service, Method, Field, Type
+import functools
 import os, re
 
+_CPP_PRIM = {'int':'int32_t','int8':'int8_t','int16':'int16_t','int32':'int32_t','int64':'int64_t','uint8':'uint8_t','uint16':'uint16_t','uint32':'uint32_t','uint64':'uint64_t','float':'float','float32':'float','float64':'double','double':'double','string':'std::string','str':'std::string','bool':'bool','None':'void'}
+
+
+@functools.lru_cache(maxsize=None)
+def _pascal_case(name: str) -> str:
+    parts = name.split('_')
+    return "".join(p[:1].upper() + p[1:] for p in parts if p)
+
+
+@functools.lru_cache(maxsize=None)
+def _cpp_type_of(t: Type) -> str:
+    # Types are interned and immutable, so each distinct one is mapped once
+    if t.inner: return f"std::vector<{_cpp_type_of(t.inner)}>"
+    if t.name in _CPP_PRIM: return _CPP_PRIM[t.name]
+    return _pascal_case(t.name)
+
 
 class CppGenerator(AbstractGenerator):
     def _to_pascal(self, name: str) -> str:
-        parts = name.split('_')
-        return "".join(p[:1].upper() + p[1:] for p in parts if p)
+        return _pascal_case(name)
 
     def _to_snake(self, name: str) -> str:
         return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
@@ -357,7 +373,4 @@ class CppGenerator(AbstractGenerator):
         return "\n".join(lines)
 
     def _cpp_type(self, t: Type, is_return=False) -> str:
-        if t.inner: return f"std::vector<{self._cpp_type(t.inner)}>"
-        mapping = {'int':'int32_t','int8':'int8_t','int16':'int16_t','int32':'int32_t','int64':'int64_t','uint8':'uint8_t','uint16':'uint16_t','uint32':'uint32_t','uint64':'uint64_t','float':'float','float32':'float','float64':'double','double':'double','string':'std::string','str':'std::string','bool':'bool','None':'void'}
-        if t.name in mapping: return mapping[t.name]
-        return self._to_pascal(t.name)
+        return _cpp_type_of(t)
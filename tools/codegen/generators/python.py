@@ -2,6 +2,29 @@ from .base import AbstractGenerator
 from ..models import Struct, Service, Method, Field, Type
 import struct
 
+# Precompiled struct.Struct objects emitted at the top of bindings.py; the
+# generated code calls their pack/unpack_from directly instead of having
+# struct.pack look the format string up on every call.
+_STRUCT_DEFS = [
+    ('_S_I8', '>b'), ('_S_I16', '>h'), ('_S_I32', '>i'), ('_S_I64', '>q'),
+    ('_S_U8', '>B'), ('_S_U16', '>H'), ('_S_U32', '>I'), ('_S_U64', '>Q'),
+    ('_S_F32', '>f'), ('_S_F64', '>d'), ('_S_BOOL', '>?'),
+]
+
+# Primitive IDL type -> (Struct constant, encoded size, default when None)
+_PY_PRIM = {
+    'int': ('_S_I32', 4, '0'), 'int32': ('_S_I32', 4, '0'),
+    'int8': ('_S_I8', 1, '0'), 'int16': ('_S_I16', 2, '0'), 'int64': ('_S_I64', 8, '0'),
+    'uint8': ('_S_U8', 1, '0'), 'uint16': ('_S_U16', 2, '0'),
+    'uint32': ('_S_U32', 4, '0'), 'uint64': ('_S_U64', 8, '0'),
+    'float': ('_S_F32', 4, '0.0'), 'float32': ('_S_F32', 4, '0.0'),
+    'double': ('_S_F64', 8, '0.0'), 'float64': ('_S_F64', 8, '0.0'),
+    'bool': ('_S_BOOL', 1, 'False'),
+}
+
+# Struct constant -> format code, for packing a whole primitive list at once
+_STRUCT_CODES = {name: fmt[1:] for name, fmt in _STRUCT_DEFS}
+
 class PythonGenerator(AbstractGenerator):
     def generate(self, structs: list[Struct], services: list[Service], output_dir: str = "build/generated") -> dict[str, str]:
         # 1. Bindings
@@ -9,25 +32,36 @@ class PythonGenerator(AbstractGenerator):
             "import struct",
             "from typing import List, Any",
             "",
+        ]
+        bind_lines.extend(f"{name} = struct.Struct('{fmt}')" for name, fmt in _STRUCT_DEFS)
+        bind_lines.extend([
+            "",
             "class SomeIpMessage: pass",
             ""
-        ]
+        ])
         
         for s in structs:
             bind_lines.append(self._generate_struct(s))
             bind_lines.append("")
 
-        for svc in services:
+        # Request/Response class names per method, shared by both files
+        prepared = [self._prepare_methods(svc) for svc in services]
+
+        for svc, methods in zip(services, prepared):
             bind_lines.append(f"# --- Service {svc.name} ---")
-            for m in svc.methods:
-                method_pascal = m.name.title().replace('_', '')
-                req_name = f"{svc.name}{method_pascal}Request"
-                bind_lines.append(self._generate_struct(Struct(req_name, m.args)))
-                res_name = f"{svc.name}{method_pascal}Response"
+            # Methods with the same signature share one class; later names alias it
+            emitted = {}
+            for m, req_name, res_name in methods:
                 res_fields = []
                 if m.ret_type.name != "None":
                     res_fields.append(Field("result", m.ret_type))
-                bind_lines.append(self._generate_struct(Struct(res_name, res_fields)))
+                for name, fields in ((req_name, m.args), (res_name, res_fields)):
+                    key = tuple(fields)
+                    if key in emitted:
+                        bind_lines.append(f"{name} = {emitted[key]}")
+                    else:
+                        emitted[key] = name
+                        bind_lines.append(self._generate_struct(Struct(name, fields)))
                 bind_lines.append("")
 
             for f in svc.fields:
@@ -55,7 +89,7 @@ class PythonGenerator(AbstractGenerator):
             ""
         ]
         
-        for svc in services:
+        for svc, methods in zip(services, prepared):
             # Stub
             runtime_lines.append(f"class {svc.name}Stub(RequestHandler):")
             runtime_lines.append(f"    SERVICE_ID = {svc.id}")
@@ -76,13 +110,11 @@ class PythonGenerator(AbstractGenerator):
             runtime_lines.append("    def handle(self, header, payload):")
             runtime_lines.append("        mid = header['method_id']")
             runtime_lines.append(f"        print(f'DEBUG: {svc.name} handling method {{mid}}')")
-            for m in svc.methods:
-                method_pascal = m.name.title().replace('_', '')
+            for m, req_name, res_name in methods:
                 runtime_lines.append(f"        if mid == {m.id}:")
-                runtime_lines.append(f"            req = {svc.name}{method_pascal}Request.deserialize(payload)")
+                runtime_lines.append(f"            req = {req_name}.deserialize(payload)")
                 args_call = ", ".join([f"req.{f.name}" for f in m.args])
                 runtime_lines.append(f"            result = self.{m.name}({args_call})")
-                res_name = f"{svc.name}{method_pascal}Response"
                 if m.ret_type.name != "None":
                     runtime_lines.append(f"            res = {res_name}(result)")
                 else:
@@ -90,7 +122,6 @@ class PythonGenerator(AbstractGenerator):
                 runtime_lines.append("            return res.serialize()")
             runtime_lines.append("        return None")
             for m in svc.methods:
-                method_pascal = m.name.title().replace('_', '')
                 runtime_lines.append(f"    def {m.name}(self, {', '.join([a.name for a in m.args])}): raise NotImplementedError()")
             
             for f in svc.fields:
@@ -125,11 +156,10 @@ class PythonGenerator(AbstractGenerator):
                 runtime_lines.append(f"            if '{e.name}' in self.event_handlers: self.event_handlers['{e.name}'](ev)")
                 has_event = True
             if not has_event: runtime_lines.append("        pass")
-            for m in svc.methods:
-                method_pascal = m.name.title().replace('_', '')
+            for m, req_name, res_name in methods:
                 args = ", ".join([f.name for f in m.args])
                 runtime_lines.append(f"    def {m.name}(self, {args}):")
-                runtime_lines.append(f"        req = {svc.name}{method_pascal}Request()")
+                runtime_lines.append(f"        req = {req_name}()")
                 for f in m.args:
                     runtime_lines.append(f"        req.{f.name} = {f.name}")
                 runtime_lines.append(f"        target = self.runtime.remote_services.get((self.SERVICE_ID, self.MAJOR_VERSION))")
@@ -141,7 +171,6 @@ class PythonGenerator(AbstractGenerator):
                 runtime_lines.append("        if target:")
                 runtime_lines.append(f"            res_payload = self.runtime.send_request(self.SERVICE_ID, {m.id}, req.serialize(), target, wait_for_response={wait_for_res})")
                 if wait_for_res:
-                    res_name = f"{svc.name}{method_pascal}Response"
                     runtime_lines.append(f"            if res_payload:")
                     runtime_lines.append(f"                res_obj = {res_name}.deserialize(res_payload)")
                     runtime_lines.append(f"                return res_obj.result")
@@ -150,10 +179,18 @@ class PythonGenerator(AbstractGenerator):
 
         import os
         return {
-            os.path.join(output_dir, "python/bindings.py"): "\n".join(bind_lines),
-            os.path.join(output_dir, "python/runtime.py"): "\n".join(runtime_lines)
+            os.path.join(output_dir, "python", "bindings.py"): "\n".join(bind_lines),
+            os.path.join(output_dir, "python", "runtime.py"): "\n".join(runtime_lines)
         }
 
+    def _prepare_methods(self, svc: Service) -> list[tuple[Method, str, str]]:
+        """Return (method, request class, response class) for each method of svc."""
+        prepared = []
+        for m in svc.methods:
+            method_pascal = m.name.title().replace('_', '')
+            prepared.append((m, f"{svc.name}{method_pascal}Request", f"{svc.name}{method_pascal}Response"))
+        return prepared
+
     def _generate_struct(self, s: Struct) -> str:
         lines = [f"class {s.name}:"]
         # Use name=None for all arguments to avoid positional argument errors
@@ -185,7 +222,15 @@ class PythonGenerator(AbstractGenerator):
 
     def _ser_val_py(self, expr: str, t: Type, indent: str) -> str:
         lines = []
-        if t.inner: # List
+        if t.inner and not t.inner.inner and t.inner.name in _PY_PRIM: # List of fixed-size primitives
+             packer, size, default = _PY_PRIM[t.inner.name]
+             code = _STRUCT_CODES[packer]
+             lines.append(f"{indent}if {expr} is None: {expr} = []")
+             lines.append(f"{indent}_v = {expr}")
+             lines.append(f"{indent}if None in _v: _v = [_x or {default} for _x in _v]")
+             lines.append(f"{indent}buffer.extend(_S_U32.pack({size} * len(_v)))")
+             lines.append(f"{indent}buffer.extend(struct.pack(f'>{{len(_v)}}{code}', *_v))")
+        elif t.inner: # List
              lines.append(f"{indent}if {expr} is None: {expr} = []")
              lines.append(f"{indent}_t_buf = bytearray()")
              lines.append(f"{indent}for _item in {expr}:")
@@ -194,30 +239,30 @@ class PythonGenerator(AbstractGenerator):
              lines.append(f"{indent}    buffer = _t_buf")
              lines.append(self._ser_val_py("_item", t.inner, indent + "    "))
              lines.append(f"{indent}    buffer = _orig_buf")
-             lines.append(f"{indent}buffer.extend(struct.pack('>I', len(_t_buf)))")
+             lines.append(f"{indent}buffer.extend(_S_U32.pack(len(_t_buf)))")
              lines.append(f"{indent}buffer.extend(_t_buf)")
-        elif t.name in ('int', 'int32'): lines.append(f"{indent}buffer.extend(struct.pack('>i', {expr} or 0))")
-        elif t.name == 'int8': lines.append(f"{indent}buffer.extend(struct.pack('>b', {expr} or 0))")
-        elif t.name == 'int16': lines.append(f"{indent}buffer.extend(struct.pack('>h', {expr} or 0))")
-        elif t.name == 'int64': lines.append(f"{indent}buffer.extend(struct.pack('>q', {expr} or 0))")
-        elif t.name == 'uint8': lines.append(f"{indent}buffer.extend(struct.pack('>B', {expr} or 0))")
-        elif t.name == 'uint16': lines.append(f"{indent}buffer.extend(struct.pack('>H', {expr} or 0))")
-        elif t.name == 'uint32': lines.append(f"{indent}buffer.extend(struct.pack('>I', {expr} or 0))")
-        elif t.name == 'uint64': lines.append(f"{indent}buffer.extend(struct.pack('>Q', {expr} or 0))")
-        elif t.name in ('float', 'float32'): lines.append(f"{indent}buffer.extend(struct.pack('>f', {expr} or 0.0))")
-        elif t.name in ('double', 'float64'): lines.append(f"{indent}buffer.extend(struct.pack('>d', {expr} or 0.0))")
-        elif t.name == 'bool': lines.append(f"{indent}buffer.extend(struct.pack('>?', {expr} or False))")
+        elif t.name in _PY_PRIM:
+             packer, _, default = _PY_PRIM[t.name]
+             lines.append(f"{indent}buffer.extend({packer}.pack({expr} or {default}))")
         elif t.name in ('str', 'string'):
              lines.append(f"{indent}_b = ({expr} or '').encode('utf-8')")
-             lines.append(f"{indent}buffer.extend(struct.pack('>I', len(_b)) + _b)")
+             lines.append(f"{indent}buffer.extend(_S_U32.pack(len(_b)) + _b)")
         else: # Struct
              lines.append(f"{indent}if {expr}: buffer.extend({expr}.serialize())")
         return "\n".join(lines)
 
     def _deser_val_py(self, expr_target: str, t: Type, indent: str) -> str:
         lines = []
-        if t.inner:
-             lines.append(f"{indent}_l = struct.unpack_from('>I', data, off)[0]; off += 4")
+        if t.inner and not t.inner.inner and t.inner.name in _PY_PRIM: # List of fixed-size primitives
+             packer, size, _ = _PY_PRIM[t.inner.name]
+             code = _STRUCT_CODES[packer]
+             lines.append(f"{indent}_l = _S_U32.unpack_from(data, off)[0]; off += 4")
+             if size > 1:
+                 # A partial trailing element would otherwise be dropped silently
+                 lines.append(f"{indent}if _l % {size}: raise struct.error(f'list length {{_l}} is not a multiple of {size}')")
+             lines.append(f"{indent}{expr_target} = list(struct.unpack_from(f'>{{_l // {size}}}{code}', data, off)); off += _l")
+        elif t.inner:
+             lines.append(f"{indent}_l = _S_U32.unpack_from(data, off)[0]; off += 4")
              lines.append(f"{indent}_e = off + _l")
              lines.append(f"{indent}_items = []")
              lines.append(f"{indent}while off < _e:")
@@ -225,19 +270,11 @@ class PythonGenerator(AbstractGenerator):
              lines.append(self._deser_val_py("_sub", t.inner, indent + "    "))
              lines.append(f"{indent}    _items.append(_sub)")
              lines.append(f"{indent}{expr_target} = _items")
-        elif t.name in ('int', 'int32'): lines.append(f"{indent}{expr_target} = struct.unpack_from('>i', data, off)[0]; off += 4")
-        elif t.name == 'int8': lines.append(f"{indent}{expr_target} = struct.unpack_from('>b', data, off)[0]; off += 1")
-        elif t.name == 'int16': lines.append(f"{indent}{expr_target} = struct.unpack_from('>h', data, off)[0]; off += 2")
-        elif t.name == 'int64': lines.append(f"{indent}{expr_target} = struct.unpack_from('>q', data, off)[0]; off += 8")
-        elif t.name == 'uint8': lines.append(f"{indent}{expr_target} = struct.unpack_from('>B', data, off)[0]; off += 1")
-        elif t.name == 'uint16': lines.append(f"{indent}{expr_target} = struct.unpack_from('>H', data, off)[0]; off += 2")
-        elif t.name == 'uint32': lines.append(f"{indent}{expr_target} = struct.unpack_from('>I', data, off)[0]; off += 4")
-        elif t.name == 'uint64': lines.append(f"{indent}{expr_target} = struct.unpack_from('>Q', data, off)[0]; off += 8")
-        elif t.name in ('float', 'float32'): lines.append(f"{indent}{expr_target} = struct.unpack_from('>f', data, off)[0]; off += 4")
-        elif t.name in ('double', 'float64'): lines.append(f"{indent}{expr_target} = struct.unpack_from('>d', data, off)[0]; off += 8")
-        elif t.name == 'bool': lines.append(f"{indent}{expr_target} = struct.unpack_from('>?', data, off)[0]; off += 1")
+        elif t.name in _PY_PRIM:
+             packer, size, _ = _PY_PRIM[t.name]
+             lines.append(f"{indent}{expr_target} = {packer}.unpack_from(data, off)[0]; off += {size}")
         elif t.name in ('str', 'string'):
-             lines.append(f"{indent}_slen = struct.unpack_from('>I', data, off)[0]; off += 4")
+             lines.append(f"{indent}_slen = _S_U32.unpack_from(data, off)[0]; off += 4")
              lines.append(f"{indent}{expr_target} = data[off:off+_slen].decode('utf-8'); off += _slen")
         else: # Struct
              lines.append(f"{indent}{expr_target}, _c = {t.name}.deserialize_from(data, off)")
@@ -5,14 +5,72 @@ Generates per-service Rust binding files with typed server stubs and client prox
 """
 from .base import AbstractGenerator
 from ..models import Struct, Service, Method, Field, Type
+import functools
 import os
 import re
+from typing import NamedTuple, Optional
+
+_RUST_PRIM = {
+    'int': 'i32', 'int32': 'i32', 'int8': 'i8', 'int16': 'i16', 'int64': 'i64',
+    'uint8': 'u8', 'uint16': 'u16', 'uint32': 'u32', 'uint64': 'u64',
+    'float': 'f32', 'float32': 'f32', 'float64': 'f64', 'double': 'f64',
+    'string': 'String', 'str': 'String', 'bool': 'bool', 'None': '()'
+}
+
+# Minimum encoded size per Rust type; String and Vec contribute their
+# 4-byte length prefix.
+_RUST_WIRE_SIZE = {
+    'i8': 1, 'i16': 2, 'i32': 4, 'i64': 8, 'u8': 1, 'u16': 2, 'u32': 4, 'u64': 8,
+    'f32': 4, 'f64': 8, 'bool': 1, 'String': 4, '()': 0,
+}
+
+
+class _PreparedMethod(NamedTuple):
+    """Per-method names and argument lists shared by every Rust section."""
+    method: Method
+    pascal: str
+    req_name: str
+    res_name: str
+    args_sig: str
+    call_args: str
+    field_inits: str
+    ret_rs: Optional[str]  # None for methods without a return value
+    req_size: int  # Lower bound on the serialized request, for Vec capacity
+    res_size: int
+
+
+@functools.lru_cache(maxsize=None)
+def _pascal_case(name: str) -> str:
+    parts = name.split('_')
+    return "".join(p[:1].upper() + p[1:] for p in parts if p)
+
+
+def _min_wire_size(fields, structs: dict, seen: frozenset = frozenset()) -> int:
+    """Lower bound on the encoded size of fields; unknown or recursive types count as 0."""
+    size = 0
+    for f in fields:
+        t = f.type
+        if t.inner:
+            size += 4
+        elif t.name in structs and t.name not in seen:
+            size += _min_wire_size(structs[t.name].fields, structs, seen | {t.name})
+        else:
+            size += _RUST_WIRE_SIZE.get(_rust_type_of(t), 0)
+    return size
+
+
+@functools.lru_cache(maxsize=None)
+def _rust_type_of(t: Type) -> str:
+    # Types are interned and immutable, so each distinct one is mapped once
+    if t.inner:
+        return f"Vec<{_rust_type_of(t.inner)}>"
+    if t.name in _RUST_PRIM: return _RUST_PRIM[t.name]
+    return _pascal_case(t.name)
 
 
 class RustGenerator(AbstractGenerator):
     def _to_pascal(self, name: str) -> str:
-        parts = name.split('_')
-        return "".join(p[:1].upper() + p[1:] for p in parts if p)
+        return _pascal_case(name)
 
     def _to_snake(self, name: str) -> str:
         return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
@@ -92,16 +150,25 @@ class RustGenerator(AbstractGenerator):
             lines.append("use super::types::*;")
         lines.append("")
 
-        # Request/Response/Event structs
-        for m in svc.methods:
-            method_pascal = self._to_pascal(m.name)
-            req_name = f"{pasc}{method_pascal}Request"
-            lines.append(self._generate_struct(Struct(req_name, m.args), req_name))
-            res_name = f"{pasc}{method_pascal}Response"
+        prepared = self._prepare_methods(svc, pasc, all_structs)
+
+        # Request/Response/Event structs. Methods with the same signature share
+        # one struct; later names become aliases, which cuts the serializer
+        # impls rustc has to check and codegen.
+        emitted = {}
+        for p in prepared:
+            m = p.method
             res_fields = []
-            if m.ret_type.name != "None":
+            if p.ret_rs is not None:
                 res_fields.append(Field("result", m.ret_type))
-            lines.append(self._generate_struct(Struct(res_name, res_fields), res_name))
+            for name, fields in ((p.req_name, m.args), (p.res_name, res_fields)):
+                key = tuple(fields)
+                if key in emitted:
+                    lines.append("#[allow(dead_code)]")
+                    lines.append(f"pub type {name} = {emitted[key]};")
+                else:
+                    emitted[key] = name
+                    lines.append(self._generate_struct(Struct(name, fields), name))
             lines.append("")
 
         for e in svc.events:
@@ -111,16 +178,36 @@ class RustGenerator(AbstractGenerator):
             lines.append("")
 
         # Provider Trait
-        lines.append(self._generate_provider_trait(svc, pasc))
+        lines.append(self._generate_provider_trait(svc, pasc, prepared))
 
         # Server Stub
-        lines.append(self._generate_server_stub(svc, pasc))
+        lines.append(self._generate_server_stub(svc, pasc, prepared))
 
         # Client Proxy
-        lines.append(self._generate_client_proxy(svc, pasc))
+        lines.append(self._generate_client_proxy(svc, pasc, prepared))
 
         return "\n".join(lines)
 
+    def _prepare_methods(self, svc: Service, svc_pascal: str, all_structs: list[Struct]) -> list[_PreparedMethod]:
+        """Compute each method's names and argument lists once per service."""
+        struct_map = {s.name: s for s in all_structs}
+        prepared = []
+        for m in svc.methods:
+            method_pascal = self._to_pascal(m.name)
+            prepared.append(_PreparedMethod(
+                method=m,
+                pascal=method_pascal,
+                req_name=f"{svc_pascal}{method_pascal}Request",
+                res_name=f"{svc_pascal}{method_pascal}Response",
+                args_sig=", ".join([f"{a.name}: {self._rust_type(a.type)}" for a in m.args]),
+                call_args=", ".join([f"req.{a.name}" for a in m.args]),
+                field_inits=", ".join([a.name for a in m.args]),
+                ret_rs=self._rust_type(m.ret_type) if m.ret_type.name != "None" else None,
+                req_size=_min_wire_size(m.args, struct_map),
+                res_size=_min_wire_size([Field("result", m.ret_type)], struct_map),
+            ))
+        return prepared
+
     def _generate_struct(self, s: Struct, struct_name: str) -> str:
         lines = []
         lines.append(f"#[allow(dead_code)]")
@@ -152,18 +239,17 @@ class RustGenerator(AbstractGenerator):
         lines.append("}")
         return "\n".join(lines)
 
-    def _generate_provider_trait(self, svc: Service, trait_name: str) -> str:
+    def _generate_provider_trait(self, svc: Service, trait_name: str, prepared: list[_PreparedMethod]) -> str:
         lines = []
         lines.append(f"#[allow(dead_code)]")
         lines.append(f"pub trait {trait_name}Provider: Send + Sync {{")
-        for m in svc.methods:
-            args_str = ", ".join([f"{a.name}: {self._rust_type(a.type)}" for a in m.args])
-            ret_str = f" -> {self._rust_type(m.ret_type)}" if m.ret_type.name != "None" else ""
-            lines.append(f"    fn {m.name}(&self, {args_str}){ret_str};")
+        for p in prepared:
+            ret_str = f" -> {p.ret_rs}" if p.ret_rs is not None else ""
+            lines.append(f"    fn {p.method.name}(&self, {p.args_sig}){ret_str};")
         lines.append("}")
         return "\n".join(lines)
 
-    def _generate_server_stub(self, svc: Service, svc_pascal: str) -> str:
+    def _generate_server_stub(self, svc: Service, svc_pascal: str, prepared: list[_PreparedMethod]) -> str:
         lines = []
         lines.append(f"#[allow(dead_code)]")
         lines.append(f"pub struct {svc_pascal}Server<T> {{")
@@ -200,22 +286,19 @@ class RustGenerator(AbstractGenerator):
         lines.append("    fn handle(&self, header: &SomeIpHeader, _payload: &[u8]) -> Option<Vec<u8>> {")
         lines.append(f"        if header.service_id != {svc_pascal}Server::<()>::SERVICE_ID {{ return None; }}")
         lines.append("        match header.method_id {")
-        for m in svc.methods:
-            method_pascal = self._to_pascal(m.name)
-            req_name = f"{svc_pascal}{method_pascal}Request"
-            res_name = f"{svc_pascal}{method_pascal}Response"
+        for p in prepared:
+            m = p.method
             lines.append(f"            {svc_pascal}Server::<()>::METHOD_{m.name.upper()} => {{")
             lines.append(f"                let mut cursor = Cursor::new(_payload);")
             req_binding = "_req" if len(m.args) == 0 else "req"
-            lines.append(f"                if let Ok({req_binding}) = {req_name}::deserialize(&mut cursor) {{")
-            call_args = ", ".join([f"req.{a.name}" for a in m.args])
-            if m.ret_type.name != "None":
-                lines.append(f"                    let result = self.provider.{m.name}({call_args});")
-                lines.append(f"                    let resp = {res_name} {{ result }};")
+            lines.append(f"                if let Ok({req_binding}) = {p.req_name}::deserialize(&mut cursor) {{")
+            if p.ret_rs is not None:
+                lines.append(f"                    let result = self.provider.{m.name}({p.call_args});")
+                lines.append(f"                    let resp = {p.res_name} {{ result }};")
             else:
-                lines.append(f"                    self.provider.{m.name}({call_args});")
-                lines.append(f"                    let resp = {res_name} {{}};")
-            lines.append("                    let mut out = Vec::new();")
+                lines.append(f"                    self.provider.{m.name}({p.call_args});")
+                lines.append(f"                    let resp = {p.res_name} {{}};")
+            lines.append(f"                    let mut out = Vec::with_capacity({p.res_size});")
             lines.append("                    resp.serialize(&mut out).ok()?;")
             lines.append("                    Some(out)")
             lines.append("                } else { None }")
@@ -226,7 +309,7 @@ class RustGenerator(AbstractGenerator):
         lines.append("}")
         return "\n".join(lines)
 
-    def _generate_client_proxy(self, svc: Service, svc_pascal: str) -> str:
+    def _generate_client_proxy(self, svc: Service, svc_pascal: str, prepared: list[_PreparedMethod]) -> str:
         lines = []
         lines.append(f"#[allow(dead_code)]")
         lines.append(f"pub struct {svc_pascal}Client {{")
@@ -245,23 +328,22 @@ class RustGenerator(AbstractGenerator):
         lines.append(f"    pub const MAJOR_VERSION: u32 = {svc.major_version};")
         lines.append(f"    pub const MINOR_VERSION: u32 = {svc.minor_version};")
 
-        for m in svc.methods:
-            method_pascal = self._to_pascal(m.name)
-            args_str = ", ".join([f"{a.name}: {self._rust_type(a.type)}" for a in m.args])
-            ret_type = f"std::io::Result<{self._rust_type(m.ret_type)}>" if m.ret_type.name != "None" else "std::io::Result<()>"
-
-            lines.append(f"    pub fn {m.name}(&self, {args_str}) -> {ret_type} {{")
-            req_name = f"{svc_pascal}{method_pascal}Request"
-            field_inits = ", ".join([f"{a.name}" for a in m.args])
-            lines.append(f"        let req = {req_name} {{ {field_inits} }};")
-            lines.append("        let mut payload = Vec::new();")
+        for p in prepared:
+            m = p.method
+            ret_type = f"std::io::Result<{p.ret_rs}>" if p.ret_rs is not None else "std::io::Result<()>"
+
+            lines.append(f"    pub fn {m.name}(&self, {p.args_sig}) -> {ret_type} {{")
+            lines.append(f"        let req = {p.req_name} {{ {p.field_inits} }};")
+            lines.append(f"        let mut payload = Vec::with_capacity({p.req_size});")
             lines.append(f"        req.serialize(&mut payload)?;")
             lines.append(f"        let header = SomeIpHeader::new(Self::SERVICE_ID, {svc_pascal}Server::<()>::METHOD_{m.name.upper()}, 0x1234, 0x01, 0x01, payload.len() as u32);")
-            lines.append("        let mut msg = header.serialize().to_vec();")
-            lines.append("        msg.extend(payload);")
+            lines.append("        let header_bytes = header.serialize();")
+            lines.append("        let mut msg = Vec::with_capacity(header_bytes.len() + payload.len());")
+            lines.append("        msg.extend_from_slice(&header_bytes);")
+            lines.append("        msg.extend_from_slice(&payload);")
             lines.append("        self.transport.send(&msg, Some(self.target))?;")
 
-            if m.ret_type.name != "None":
+            if p.ret_rs is not None:
                 lines.append(f"        Err(std::io::Error::new(std::io::ErrorKind::Other, \"Sync RPC not yet implemented in client\"))")
             else:
                 lines.append("        Ok(())")
@@ -270,13 +352,4 @@ class RustGenerator(AbstractGenerator):
         return "\n".join(lines)
 
     def _rust_type(self, t: Type) -> str:
-        if t.inner:
-            return f"Vec<{self._rust_type(t.inner)}>"
-        mapping = {
-            'int': 'i32', 'int32': 'i32', 'int8': 'i8', 'int16': 'i16', 'int64': 'i64',
-            'uint8': 'u8', 'uint16': 'u16', 'uint32': 'u32', 'uint64': 'u64',
-            'float': 'f32', 'float32': 'f32', 'float64': 'f64', 'double': 'f64',
-            'string': 'String', 'str': 'String', 'bool': 'bool', 'None': '()'
-        }
-        if t.name in mapping: return mapping[t.name]
-        return self._to_pascal(t.name)
+        return _rust_type_of(t)
@@ -17,21 +17,47 @@ Usage:
     python -m tools.codegen.main --project automotive_pubsub \\
         --lang rust \\
         --module examples.automotive_pubsub.idl
+
+    # Several projects in one run:
+    python -m tools.codegen.main \\
+        --project integrated_apps:examples.integrated_apps.idl \\
+        --project automotive_pubsub:examples.automotive_pubsub.idl \\
+        --lang rust cpp ts python
 """
 
 import sys
 import os
 import argparse
-
-
-def main():
+import importlib
+
+# Language -> (generator module, class). Modules are imported only when the
+# language is requested, so a single-language run skips the other backends.
+BACKENDS = {
+    "rust": (".generators.rust", "RustGenerator"),
+    "cpp": (".generators.cpp", "CppGenerator"),
+    "ts": (".generators.ts", "TsGenerator"),
+    "python": (".generators.python", "PythonGenerator"),
+}
+
+
+def main(argv=None, out=None):
+    """Run the generator; argv defaults to sys.argv[1:].
+
+    Importable, so build tooling can generate in-process instead of paying
+    for a fresh interpreter. Progress lines go to out (default sys.stdout),
+    which lets a caller log them without redirecting the whole process.
+    """
+    if out is None:
+        out = sys.stdout
     parser = argparse.ArgumentParser(description="Fusion Hawking Code Generator")
 
     # New per-project mode
-    parser.add_argument("--project", help="Project name for isolated output (e.g. integrated_apps)")
+    parser.add_argument("--project", action="append", metavar="NAME[:MODULE]",
+                        help="Project name for isolated output (e.g. integrated_apps). "
+                             "Repeat as NAME:MODULE to generate several projects in one run")
     parser.add_argument("--module", help="Python module path to scan (e.g. examples.integrated_apps.idl)")
     parser.add_argument("--lang", nargs="+", default=["rust", "cpp", "ts"],
-                        choices=["rust", "cpp", "ts", "python"],
+                        choices=list(BACKENDS),
                         help="Languages to generate (default: rust cpp ts)")
     parser.add_argument("--output-dir", default="build/generated",
                         help="Base output directory (default: build/generated)")
@@ -39,22 +65,43 @@ def main():
     # Legacy mode: positional IDL files
     parser.add_argument("files", nargs="*", help="Legacy: path to IDL file(s)")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     project_root = os.getcwd()
 
-    if args.module:
+    # Each job is (output_dir, structs, services)
+    projects = args.project or []
+    specs = [p.partition(":") for p in projects]
+    if any(sep for _, sep, _ in specs):
+        # === Multi-project mode: NAME:MODULE pairs ===
+        if args.module or args.files or not all(sep for _, sep, _ in specs):
+            parser.error("--project NAME:MODULE cannot be combined with --module, "
+                         "IDL files or a bare --project NAME")
+        from .scanner import scan_many
+        modules = [module for _, _, module in specs]
+        print(f"[codegen] Scanning modules: {', '.join(modules)}", file=out)
+        jobs = []
+        for (name, _, _), (structs, services) in zip(specs, scan_many(modules, project_root=project_root)):
+            print(f"[codegen] {name}: found {len(structs)} types and {len(services)} services", file=out)
+            jobs.append((os.path.join(args.output_dir, name), structs, services))
+
+    elif len(projects) > 1:
+        parser.error("--project may only be repeated in NAME:MODULE form")
+        return
+
+    elif args.module:
         # === New introspection-based mode ===
         from .scanner import scan
-        print(f"[codegen] Scanning module: {args.module}")
+        print(f"[codegen] Scanning module: {args.module}", file=out)
         structs, services = scan(args.module, project_root=project_root)
-        print(f"[codegen] Found {len(structs)} types and {len(services)} services")
+        print(f"[codegen] Found {len(structs)} types and {len(services)} services", file=out)
 
         # Determine output directory
-        if args.project:
-            output_dir = os.path.join(args.output_dir, args.project)
+        if projects:
+            output_dir = os.path.join(args.output_dir, projects[0])
         else:
             output_dir = args.output_dir
+        jobs = [(output_dir, structs, services)]
 
     elif args.files:
         # === Legacy AST mode (backward compat) ===
@@ -62,19 +109,26 @@ def main():
         ast_parser = PythonASTParser()
         all_structs, all_services = [], []
 
+        # Parse each file once even if it is listed more than once; the
+        # parsed model is shared by every generator below.
+        seen = set()
         for idl_file in args.files:
-            print(f"[codegen] Parsing {idl_file}...")
+            key = os.path.normcase(os.path.abspath(idl_file))
+            if key in seen:
+                continue
+            seen.add(key)
+            print(f"[codegen] Parsing {idl_file}...", file=out)
             structs, services = ast_parser.parse(idl_file)
-            print(f"[codegen] Found {len(structs)} structs and {len(services)} services.")
+            print(f"[codegen] Found {len(structs)} structs and {len(services)} services.", file=out)
             all_structs.extend(structs)
             all_services.extend(services)
 
-        structs, services = all_structs, all_services
         output_dir = args.output_dir
 
         # Infer project name from file path for per-project output
-        if args.project:
-            output_dir = os.path.join(args.output_dir, args.project)
+        if projects:
+            output_dir = os.path.join(args.output_dir, projects[0])
+        jobs = [(output_dir, all_structs, all_services)]
 
     else:
         parser.error("Either --module or positional IDL files are required.")
@@ -83,46 +137,71 @@ def main():
     # ID validation (optional)
     try:
         from tools.id_manager.manager import IDManager
-        print("[codegen] Validating Service IDs...")
+        print("[codegen] Validating Service IDs...", file=out)
         id_mgr = IDManager(project_root)
         id_mgr.scan_ids()
     except ImportError:
         pass
     except Exception as e:
-        print(f"[codegen] Warning: ID validation failed: {e}")
+        print(f"[codegen] Warning: ID validation failed: {e}", file=out)
 
     # Generate bindings
     generators = _get_generators(args.lang)
-    output_files = {}
-    for gen in generators:
-        output_files.update(gen.generate(structs, services, output_dir=output_dir))
-
-    # Write files
-    for filename, content in output_files.items():
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        print(f"[codegen] Writing {filename}")
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(content)
+    for output_dir, structs, services in jobs:
+        output_files = {}
+        for gen in generators:
+            output_files.update(gen.generate(structs, services, output_dir=output_dir))
+
+        # Write files
+        for filename, content in output_files.items():
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            # Encode once and write bytes: skips the text layer's newline
+            # translation, so outputs are byte-identical on every platform.
+            if _write_if_changed(filename, content.encode("utf-8")):
+                print(f"[codegen] Writing {filename}", file=out)
+            else:
+                print(f"[codegen] Unchanged {filename}", file=out)
+
+        print(f"[codegen] Complete. Generated {len(output_files)} files in {output_dir}/", file=out)
+
+
+def _write_if_changed(filename, data):
+    """Atomically replace filename with data unless it already holds exactly that.
+
+    Leaving identical files untouched keeps their mtimes, so cargo/cmake do not
+    rebuild on a no-op regeneration; writing via a temp file and os.replace
+    means an interrupted run never leaves a half-written source behind.
+    Returns True if the file was written.
+    """
+    try:
+        with open(filename, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
 
-    print(f"[codegen] Complete. Generated {len(output_files)} files in {output_dir}/")
+    tmp = filename + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, filename)
+    except BaseException:
+        # Do not leave the partial temp file next to the outputs
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return True
 
 
 def _get_generators(languages):
     """Create generator instances for each requested language."""
     generators = []
     for lang in languages:
-        if lang == "rust":
-            from .generators.rust import RustGenerator
-            generators.append(RustGenerator())
-        elif lang == "cpp":
-            from .generators.cpp import CppGenerator
-            generators.append(CppGenerator())
-        elif lang == "ts":
-            from .generators.ts import TsGenerator
-            generators.append(TsGenerator())
-        elif lang == "python":
-            from .generators.python import PythonGenerator
-            generators.append(PythonGenerator())
+        module_name, class_name = BACKENDS[lang]
+        module = importlib.import_module(module_name, __package__)
+        generators.append(getattr(module, class_name)())
     return generators
 
 
@@ -1,11 +1,27 @@
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-@dataclass
+# Model objects are immutable value types. __slots__ generation is only
+# available from Python 3.10; older interpreters keep a per-instance __dict__.
+_MODEL_OPTS = {'frozen': True}
+if sys.version_info >= (3, 10):
+    _MODEL_OPTS['slots'] = True
+
+@dataclass(**_MODEL_OPTS)
 class Type:
     name: str
     inner: Optional['Type'] = None  # For List[T], inner is T
-    
+
+    @classmethod
+    def get(cls, name: str, inner: Optional['Type'] = None) -> 'Type':
+        """Return the shared instance for (name, inner), creating it on first use."""
+        key = (name, inner)
+        t = _TYPE_INTERN.get(key)
+        if t is None:
+            t = _TYPE_INTERN[key] = cls(name, inner)
+        return t
+
     def __str__(self):
         if self.inner:
             return f"Vec<{self.inner}>"
@@ -15,25 +31,28 @@ class Type:
     def is_list(self) -> bool:
         return self.inner is not None
 
-@dataclass
+_TYPE_INTERN: Dict[Tuple[str, Optional[Type]], Type] = {}
+
+@dataclass(**_MODEL_OPTS)
 class Field:
     name: str
     type: Type
 
-@dataclass
+@dataclass(**_MODEL_OPTS)
 class Method:
     name: str
     id: int
     args: List[Field]
     ret_type: Type
+    fire_and_forget: bool = False
 
-@dataclass
+@dataclass(**_MODEL_OPTS)
 class Event:
     name: str
     id: int
     args: List[Field]
 
-@dataclass
+@dataclass(**_MODEL_OPTS)
 class FieldSpec: # Named FieldSpec to avoid conflict with Field
     name: str
     id: int
@@ -42,7 +61,7 @@ class FieldSpec: # Named FieldSpec to avoid conflict with Field
     set_id: Optional[int] = None
     notifier_id: Optional[int] = None
 
-@dataclass
+@dataclass(**_MODEL_OPTS)
 class Service:
     name: str
     id: int
@@ -52,7 +71,7 @@ class Service:
     major_version: int = 1
     minor_version: int = 0
 
-@dataclass
+@dataclass(**_MODEL_OPTS)
 class Struct:
     name: str
     fields: List[Field]
@@ -1,66 +1,111 @@
+from __future__ import annotations
+
 import ast
-from typing import Optional
 from .models import Service, Method, Struct, Field, Type, Event, FieldSpec
 
+# Map common IDL aliases to codegen type names
+_NAME_ALIASES = {
+    'int': 'int',
+    'float': 'float32',
+    'str': 'string',
+    'bool': 'bool'
+}
+
+
+_NO_ARGS = {}
+
+
+def _type_from_name(annotation: ast.Name) -> Type:
+    return Type.get(_NAME_ALIASES.get(annotation.id, annotation.id))
+
+
+def _type_from_subscript(annotation: ast.Subscript) -> Type:
+    value = annotation.value
+    if type(value) is ast.Name and value.id == 'List':
+        return Type.get("list", inner=_parse_annotation(annotation.slice))
+    return Type.get("Unknown")
+
+
+def _type_from_constant(annotation: ast.Constant) -> Type:
+    if annotation.value is None:
+        return Type.get("None")
+    return Type.get("Unknown")
+
+
+def _type_unknown(annotation) -> Type:
+    return Type.get("Unknown")
+
+
+# Annotation node kinds are leaf classes, so an exact-type lookup replaces
+# the isinstance ladder.
+_TYPE_DISPATCH = {
+    ast.Name: _type_from_name,
+    ast.Subscript: _type_from_subscript,
+    ast.Constant: _type_from_constant,
+}
+
+
+def _parse_annotation(annotation) -> Type:
+    """Convert an annotation AST node into a codegen Type."""
+    return _TYPE_DISPATCH.get(type(annotation), _type_unknown)(annotation)
+
+
 class AbstractParser:
     def parse(self, filepath: str) -> tuple[list[Struct], list[Service]]:
         raise NotImplementedError
 
 class PythonASTParser(AbstractParser):
     def parse(self, filepath: str) -> tuple[list[Struct], list[Service]]:
-        with open(filepath, "r") as f:
-            tree = ast.parse(f.read())
-            
+        # Read raw bytes: the parser decodes the source itself (honouring any
+        # coding cookie), so we skip a separate universal-newline decode pass.
+        with open(filepath, "rb") as f:
+            return self.parse_source(f.read(), filename=filepath)
+
+    def parse_source(self, source: str | bytes, filename: str = "<idl>") -> tuple[list[Struct], list[Service]]:
+        """Parse IDL source text that is already in memory."""
+        # Same as ast.parse, minus its wrapper; dont_inherit keeps this
+        # module's __future__ flags out of the IDL's compilation.
+        tree = compile(source, filename, "exec", ast.PyCF_ONLY_AST, dont_inherit=True)
+        return self.parse_tree(tree)
+
+    def parse_tree(self, tree: ast.Module) -> tuple[list[Struct], list[Service]]:
+        """Extract structs and services from an already-parsed IDL module."""
         structs = []
         services = []
-        
+
         for node in tree.body:
-            if isinstance(node, ast.ClassDef):
-                if self._is_dataclass(node):
-                    structs.append(self._parse_struct(node))
-                
-                service_id = self._get_decorator_id(node, 'service')
-                if service_id is not None:
-                    major = self._get_decorator_id(node, 'service', 'major_version') or 1
-                    minor = self._get_decorator_id(node, 'service', 'minor_version') or 0
-                    services.append(self._parse_service(node, service_id, major, minor))
-                    
+            # Only top-level classes carry IDL definitions
+            if type(node) is not ast.ClassDef:
+                continue
+
+            if self._is_dataclass(node):
+                structs.append(self._parse_struct(node))
+
+            svc_args = self._get_decorator_args(node).get('service', _NO_ARGS)
+            service_id = svc_args.get('id')
+            if service_id is not None:
+                major = svc_args.get('major_version') or 1
+                minor = svc_args.get('minor_version') or 0
+                services.append(self._parse_service(node, service_id, major, minor))
+
         return structs, services
 
     def _is_dataclass(self, node: ast.ClassDef) -> bool:
         for d in node.decorator_list:
-            if isinstance(d, ast.Name) and d.id == 'dataclass':
+            t = type(d)
+            if t is ast.Name and d.id == 'dataclass':
                 return True
-            if isinstance(d, ast.Attribute) and d.attr == 'dataclass':
+            if t is ast.Attribute and d.attr == 'dataclass':
                 return True
         return False
 
-    def _get_decorator_id(self, node, name: str, key: str = 'id') -> Optional[int]:
-        return self._get_decorator_id(node, name, key)
-
     def _parse_type(self, annotation) -> Type:
-        if isinstance(annotation, ast.Name):
-            name = annotation.id
-            # Map common IDL aliases if needed
-            mapping = {
-                'int': 'int',
-                'float': 'float32',
-                'str': 'string',
-                'bool': 'bool'
-            }
-            return Type(mapping.get(name, name))
-        elif isinstance(annotation, ast.Subscript):
-             if isinstance(annotation.value, ast.Name) and annotation.value.id == 'List':
-                 inner = self._parse_type(annotation.slice)
-                 return Type("list", inner=inner)
-        elif isinstance(annotation, ast.Constant) and annotation.value is None:
-             return Type("None")
-        return Type("Unknown")
+        return _parse_annotation(annotation)
 
     def _parse_struct(self, node: ast.ClassDef) -> Struct:
         fields = []
         for item in node.body:
-            if isinstance(item, ast.AnnAssign):
+            if type(item) is ast.AnnAssign:
                 name = item.target.id
                 field_type = self._parse_type(item.annotation)
                 fields.append(Field(name, field_type))
@@ -71,25 +116,29 @@ class PythonASTParser(AbstractParser):
         events = []
         fields = []
         for item in node.body:
-            if isinstance(item, ast.FunctionDef):
+            kind = type(item)
+            if kind is ast.FunctionDef:
+                # One pass over the decorators serves every check below
+                decos = self._get_decorator_args(item)
+
                 # Check for @method
-                method_id = self._get_decorator_id(item, 'method', 'id')
+                method_id = decos.get('method', _NO_ARGS).get('id')
                 if method_id is not None:
                      methods.append(self._parse_method(item, method_id))
                 
-                event_id = self._get_decorator_id(item, 'event', 'id')
+                event_id = decos.get('event', _NO_ARGS).get('id')
                 if event_id is not None:
                      events.append(self._parse_event(item, event_id))
                      
-                field_id = self._get_decorator_id(item, 'field', 'id')
-                if field_id is not None:
-                     fields.append(self._parse_field_method(item, field_id))
+                field_args = decos.get('field', _NO_ARGS)
+                if field_args.get('id') is not None:
+                     fields.append(self._parse_field_method(item, field_args))
             
-            elif isinstance(item, ast.AnnAssign):
+            elif kind is ast.AnnAssign:
                 # Check for @field
-                field_id = self._get_decorator_id(item, 'field', 'id')
-                if field_id is not None:
-                    fields.append(self._parse_field_spec(item))
+                field_args = self._get_decorator_args(item).get('field', _NO_ARGS)
+                if field_args.get('id') is not None:
+                    fields.append(self._parse_field_spec(item, field_args))
                     
         return Service(node.name, service_id, methods, events, fields, major, minor)
 
@@ -100,7 +149,7 @@ class PythonASTParser(AbstractParser):
             if arg.annotation:
                 args.append(Field(arg.arg, self._parse_type(arg.annotation)))
         
-        ret_type = Type("None")
+        ret_type = Type.get("None")
         if item.returns:
             ret_type = self._parse_type(item.returns)
             
@@ -115,41 +164,45 @@ class PythonASTParser(AbstractParser):
                 args.append(Field(arg.arg, self._parse_type(arg.annotation)))
         return Event(item.name, event_id, args)
 
-    def _parse_field_method(self, item: ast.FunctionDef, field_id: int) -> FieldSpec:
+    def _parse_field_method(self, item: ast.FunctionDef, ids: dict) -> FieldSpec:
         name = item.name
         # Type is the return type of the method
-        field_type = Type("None")
+        field_type = Type.get("None")
         if item.returns:
             field_type = self._parse_type(item.returns)
-            
-        get_id = self._get_decorator_id(item, 'field', 'get_id')
-        set_id = self._get_decorator_id(item, 'field', 'set_id')
-        notifier_id = self._get_decorator_id(item, 'field', 'notifier_id')
-        
-        return FieldSpec(name, field_id, field_type, get_id, set_id, notifier_id)
 
-    def _parse_field_spec(self, item: ast.AnnAssign) -> FieldSpec:
+        return FieldSpec(name, ids.get('id'), field_type,
+                         ids.get('get_id'), ids.get('set_id'), ids.get('notifier_id'))
+
+    def _parse_field_spec(self, item: ast.AnnAssign, ids: dict) -> FieldSpec:
         name = item.target.id
         field_type = self._parse_type(item.annotation)
-        
-        # Get decorator details
-        field_id = self._get_decorator_id(item, 'field', 'id')
-        get_id = self._get_decorator_id(item, 'field', 'get_id')
-        set_id = self._get_decorator_id(item, 'field', 'set_id')
-        notifier_id = self._get_decorator_id(item, 'field', 'notifier_id')
-        
-        return FieldSpec(name, field_id, field_type, get_id, set_id, notifier_id)
 
-    def _get_decorator_id(self, node, decorator_name: str, key: str = 'id') -> Optional[int]:
-        if not hasattr(node, 'decorator_list'): return None
+        return FieldSpec(name, ids.get('id'), field_type,
+                         ids.get('get_id'), ids.get('set_id'), ids.get('notifier_id'))
+
+    def _get_decorator_args(self, node) -> dict:
+        """Collect the literal keyword args of every called decorator in one pass.
+
+        Returns {decorator name: {keyword: value}}. The first decorator wins for
+        each name/keyword pair, and keywords whose value is not a (possibly
+        negated) constant are left out.
+        """
+        decos = {}
+        if not hasattr(node, 'decorator_list'): return decos
         for d in node.decorator_list:
-            if isinstance(d, ast.Call) and isinstance(d.func, ast.Name) and d.func.id == decorator_name:
-                for kw in d.keywords:
-                    # Parse 'id' or other keys
-                    if kw.arg == key:
-                         if isinstance(kw.value, ast.Constant):
-                             return kw.value.value
-                         # Handle unary minus for negative values if needed, mostly IDs are positive
-                         if isinstance(kw.value, ast.UnaryOp) and isinstance(kw.value.op, ast.USub) and isinstance(kw.value.operand, ast.Constant):
-                             return -kw.value.operand.value
-        return None
+            # AST node classes are leaves, so exact type checks suffice
+            if type(d) is not ast.Call or type(d.func) is not ast.Name:
+                continue
+            values = decos.setdefault(d.func.id, {})
+            for kw in d.keywords:
+                if kw.arg is None or kw.arg in values:
+                    continue
+                value = kw.value
+                value_type = type(value)
+                if value_type is ast.Constant:
+                    values[kw.arg] = value.value
+                # Handle unary minus for negative values if needed, mostly IDs are positive
+                elif value_type is ast.UnaryOp and type(value.op) is ast.USub and type(value.operand) is ast.Constant:
+                    values[kw.arg] = -value.operand.value
+        return decos
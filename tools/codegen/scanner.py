@@ -13,43 +13,58 @@ import os
 import importlib
 import inspect
 import dataclasses
-from typing import get_type_hints, List, Optional
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import get_args, get_origin, get_type_hints, List, Optional
 
 from .models import Service, Struct, Field, Type, Method, Event, FieldSpec
 
 
+# Builtin Python types and their codegen type names
+_PRIM_NAMES = {
+    int: 'int', float: 'float32', str: 'string', bool: 'bool', bytes: 'bytes'
+}
+
+
+@functools.lru_cache(maxsize=None)
 def _resolve_type(annotation) -> Type:
-    """Convert a Python type annotation to a codegen Type object."""
+    """Convert a Python type annotation to a codegen Type object.
+
+    Annotations (classes, typing generics, forward-ref strings) are hashable
+    and the conversion is pure, so results are memoized.
+    """
     if annotation is None or annotation is type(None):
-        return Type("None")
+        return Type.get("None")
 
-    origin = getattr(annotation, '__origin__', None)
-    if origin is list:
-        args = getattr(annotation, '__args__', ())
-        inner = _resolve_type(args[0]) if args else Type("Unknown")
-        return Type("list", inner=inner)
+    # Builtin primitives are the common case: one dict probe, no attribute lookups
+    prim = _PRIM_NAMES.get(annotation)
+    if prim is not None:
+        return Type.get(prim)
+
+    if get_origin(annotation) is list:
+        args = get_args(annotation)
+        inner = _resolve_type(args[0]) if args else Type.get("Unknown")
+        return Type.get("list", inner=inner)
 
     if isinstance(annotation, type):
         if dataclasses.is_dataclass(annotation):
-            return Type(annotation.__name__)
+            return Type.get(annotation.__name__)
 
-        mapping = {
-            int: 'int', float: 'float32', str: 'string', bool: 'bool', bytes: 'bytes'
-        }
-        return Type(mapping.get(annotation, annotation.__name__))
+        return Type.get(_PRIM_NAMES.get(annotation, annotation.__name__))
 
     if isinstance(annotation, str):
-        return Type(annotation)
+        return Type.get(annotation)
 
-    return Type("Unknown")
+    return Type.get("Unknown")
 
 
 def _scan_dataclass(cls) -> Struct:
     """Convert a @dataclass into a codegen Struct."""
+    # Resolve the type annotations once per class, not once per field
+    hints = get_type_hints(cls)
     fields = []
     for f in dataclasses.fields(cls):
-        # Resolve the type annotation properly
-        hints = get_type_hints(cls)
         annotation = hints.get(f.name, f.type)
         fields.append(Field(f.name, _resolve_type(annotation)))
     return Struct(cls.__name__, fields)
@@ -68,9 +83,8 @@ def _scan_service(cls) -> Service:
             args.append(Field(arg['name'], t))
 
         ret = _type_from_info(minfo['return_type'])
-        m = Method(mname, minfo['id'], args, ret)
-        m.fire_and_forget = minfo.get('fire_and_forget', False)
-        methods.append(m)
+        methods.append(Method(mname, minfo['id'], args, ret,
+                              fire_and_forget=minfo.get('fire_and_forget', False)))
 
     for ename, einfo in cls._fusion_events.items():
         args = []
@@ -99,11 +113,52 @@ def _scan_service(cls) -> Service:
 
 def _type_from_info(info: dict) -> Type:
     """Convert a type info dict (from resolve_type_info) back to a codegen Type."""
-    name = info['name']
-    inner = None
-    if info.get('inner'):
-        inner = _type_from_info(info['inner'])
-    return Type(name, inner=inner)
+    return _type_from_key(_info_key(info))
+
+
+def _info_key(info: dict) -> tuple:
+    """Freeze a type info dict into a hashable (name, inner_key) tuple."""
+    inner = info.get('inner')
+    return (info['name'], _info_key(inner) if inner else None)
+
+
+@functools.lru_cache(maxsize=None)
+def _type_from_key(key: tuple) -> Type:
+    name, inner = key
+    return Type.get(name, inner=_type_from_key(inner) if inner else None)
+
+
+# Import roots already placed on sys.path, and the cached
+# (scan_package, scan_module) pair from fusion_hawking.idl.
+_idl_scanners = None
+_init_lock = threading.Lock()
+
+
+def _add_import_root(path: str):
+    # Checked on every call: a host process may restore sys.path between scans
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def _init_scan(project_root: str = None):
+    """Make the project importable and load the fusion_hawking.idl scanners.
+
+    Missing roots are (re-)inserted into sys.path on every call; the
+    scanner functions are imported once per process.
+    """
+    global _idl_scanners
+    with _init_lock:
+        if project_root:
+            _add_import_root(project_root)
+
+        # Also ensure src/python is on path for fusion_hawking imports
+        _add_import_root(os.path.join(project_root or os.getcwd(), 'src', 'python'))
+
+        if _idl_scanners is None:
+            # Use the fusion_hawking.idl scanner to discover classes
+            from fusion_hawking.idl import scan_package, scan_module
+            _idl_scanners = (scan_package, scan_module)
+        return _idl_scanners
 
 
 def scan(module_path: str, project_root: str = None) -> tuple[list[Struct], list[Service]]:
@@ -117,16 +172,7 @@ def scan(module_path: str, project_root: str = None) -> tuple[list[Struct], list
     Returns:
         (structs, services) — same format as old PythonASTParser.parse()
     """
-    if project_root and project_root not in sys.path:
-        sys.path.insert(0, project_root)
-
-    # Also ensure src/python is on path for fusion_hawking imports
-    python_src = os.path.join(project_root or os.getcwd(), 'src', 'python')
-    if python_src not in sys.path:
-        sys.path.insert(0, python_src)
-
-    # Use the fusion_hawking.idl scanner to discover classes
-    from fusion_hawking.idl import scan_package, scan_module
+    scan_package, scan_module = _init_scan(project_root)
 
     # Try as package first, then as module
     try:
@@ -140,15 +186,20 @@ def scan(module_path: str, project_root: str = None) -> tuple[list[Struct], list
     # Also discover nested struct types referenced by services
     # (types used as method args/returns that might not be top-level)
     known_names = {s.name for s in structs}
+    seen_infos = set()
     for svc_cls in result['services']:
-        _discover_nested_types(svc_cls, result['types'], structs, known_names)
+        _discover_nested_types(svc_cls, result['types'], structs, known_names, seen_infos)
 
     return structs, services
 
 
-def _discover_nested_types(svc_cls, known_types, structs, known_names):
-    """Discover @dataclass types used in method signatures but not top-level."""
-    # Look through all type infos in methods/events/fields
+@functools.lru_cache(maxsize=None)
+def _collect_type_infos(svc_cls) -> tuple:
+    """Flatten every type info referenced by a service's methods/events/fields.
+
+    The _fusion_* metadata is fixed once the @service decorator has run, so the
+    flattened tuple is computed once per class.
+    """
     all_type_infos = []
     for minfo in svc_cls._fusion_methods.values():
         for arg in minfo['args']:
@@ -159,20 +210,52 @@ def _discover_nested_types(svc_cls, known_types, structs, known_names):
             all_type_infos.append(arg['type'])
     for finfo in svc_cls._fusion_fields.values():
         all_type_infos.append(finfo['type'])
+    return tuple(all_type_infos)
+
 
-    for tinfo in all_type_infos:
+def scan_many(module_paths: List[str], project_root: str = None) -> list[tuple[list[Struct], list[Service]]]:
+    """
+    Scan several independent IDL modules/packages concurrently.
+
+    Module imports are dominated by file I/O, so a small thread pool overlaps
+    them. Results are returned in the same order as ``module_paths``.
+    """
+    if not module_paths:
+        return []
+    # Prime sys.path and the scanner imports before fanning out
+    _init_scan(project_root)
+    with ThreadPoolExecutor(max_workers=min(8, len(module_paths))) as ex:
+        return list(ex.map(lambda p: scan(p, project_root=project_root), module_paths))
+
+
+def _discover_nested_types(svc_cls, known_types, structs, known_names, seen_infos=None):
+    """Discover @dataclass types used in method signatures but not top-level.
+
+    ``seen_infos`` holds the ids of type info dicts already walked, so a
+    service scanned twice (or sharing metadata with another) is skipped.
+    """
+    if seen_infos is None:
+        seen_infos = set()
+    for tinfo in _collect_type_infos(svc_cls):
+        key = id(tinfo)
+        if key in seen_infos:
+            continue
+        seen_infos.add(key)
+        # A known leaf type cannot contribute anything new
+        if tinfo['name'] in known_names and not tinfo.get('inner'):
+            continue
         _check_type_info(tinfo, structs, known_names)
 
 
 def _check_type_info(tinfo, structs, known_names):
-    """Recursively check if a type info references a dataclass that needs to be added."""
-    if tinfo.get('is_dataclass') and tinfo['name'] not in known_names:
-        # Reconstruct struct from the type info's fields
-        fields = []
-        for f in tinfo.get('fields', []):
-            fields.append(Field(f['name'], _type_from_info(f['type'])))
-        structs.append(Struct(tinfo['name'], fields))
-        known_names.add(tinfo['name'])
-
-    if tinfo.get('inner'):
-        _check_type_info(tinfo['inner'], structs, known_names)
+    """Walk a type info's inner chain, adding any dataclass that is not yet known."""
+    while tinfo:
+        if tinfo.get('is_dataclass') and tinfo['name'] not in known_names:
+            # Reconstruct struct from the type info's fields
+            fields = []
+            for f in tinfo.get('fields', []):
+                fields.append(Field(f['name'], _type_from_info(f['type'])))
+            structs.append(Struct(tinfo['name'], fields))
+            known_names.add(tinfo['name'])
+
+        tinfo = tinfo.get('inner')
@@ -1,14 +1,17 @@
+import ast
+import contextlib
+import functools
+import io
 import unittest
 import tempfile
 import os
 import sys
+import pathlib
+from unittest import mock
 
-# Ensure project root is in path
-sys.path.insert(0, os.getcwd())
+# Add project root to path (for 'tools.codegen'), independent of the cwd
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")))
 
-from tools.codegen.generators.rust import RustGenerator
-from tools.codegen.generators.python import PythonGenerator
-from tools.codegen.generators.cpp import CppGenerator
 from tools.codegen.models import Service, Struct, Type, Field, Method
 
 
@@ -46,6 +49,20 @@ def _make_all_primitives():
     return [Struct("AllPrimitives", fields)], []
 
 
+def _make_primitive_lists():
+    """Build a struct with flat and nested lists of fixed-size primitives."""
+    def list_of(name):
+        return Type("list", Type(name, None))
+    fields = [
+        Field("ints", list_of("int")),
+        Field("nested", Type("list", list_of("int"))),
+        Field("floats", list_of("float")),
+        Field("flags", list_of("bool")),
+        Field("longs", list_of("int64")),
+    ]
+    return [Struct("PrimitiveLists", fields)], []
+
+
 def _make_rpc_service():
     """Build a service with sync RPC and fire-and-forget methods."""
     int_type = Type("int", None)
@@ -57,27 +74,125 @@ def _make_rpc_service():
     return [], [svc]
 
 
-class TestGenerators(unittest.TestCase):
-    """Tests for code generators using model objects directly (no parser dependency)."""
+def _make_shared_signature_service():
+    """Build a service whose methods share one argument/return signature."""
+    int_type = Type("int", None)
+    add_method = Method("add", 1, [Field("a", int_type), Field("b", int_type)], int_type)
+    sub_method = Method("sub", 2, [Field("a", int_type), Field("b", int_type)], int_type)
+    svc = Service(name="MathService", id=0x5678, methods=[add_method, sub_method], events=[], fields=[], major_version=1, minor_version=0)
+    return [], [svc]
 
-    def setUp(self):
-        self.rust_gen = RustGenerator()
-        self.py_gen = PythonGenerator()
-        self.cpp_gen = CppGenerator()
+
+def _make_sized_service():
+    """Build a service with an empty, a fixed-size and a self-referential request."""
+    int_type = Type("int", None)
+    node_type = Type("Node", None)
+    node = Struct("Node", [Field("value", int_type), Field("next", node_type)])
+    methods = [
+        Method("ping", 1, [], int_type),
+        Method("add", 2, [Field("a", int_type), Field("b", int_type)], int_type),
+        Method("link", 3, [Field("node", node_type)], Type("None", None)),
+    ]
+    svc = Service(name="SizedService", id=0x9ABC, methods=methods, events=[], fields=[], major_version=1, minor_version=0)
+    return [node], [svc]
+
+
+@functools.lru_cache(maxsize=64)
+def _query_path(path_suffix):
+    """PurePath for a lookup suffix; tests query the same few paths repeatedly."""
+    return pathlib.PurePath(path_suffix)
+
+
+def _build_suffix_index(output):
+    """Map every trailing path of each generated file name to its content.
+
+    Keys are PurePath objects, which compare by components, so lookups work
+    regardless of the separator style used by the generator or the caller.
+    """
+    index = {}
+    for k, v in output.items():
+        parts = pathlib.PurePath(k).parts
+        for i in range(len(parts)):
+            index.setdefault(pathlib.PurePath(*parts[i:]), v)
+    return index
+
+
+# Named model fixtures shared by every generator test
+_FIXTURES = {
+    'simple': _make_simple_service,
+    'recursive': _make_recursive_types,
+    'primitives': _make_all_primitives,
+    'lists': _make_primitive_lists,
+    'rpc': _make_rpc_service,
+    'shared': _make_shared_signature_service,
+    'sized': _make_sized_service,
+}
+
+# id(output) -> suffix index; cached outputs live for the whole session,
+# so their ids are stable keys.
+_SUFFIX_INDEXES = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _fixture(name):
+    """Build a named (structs, services) fixture once per test session.
+
+    Models are immutable, so the same objects can be shared across tests.
+    """
+    return _FIXTURES[name]()
+
+
+@functools.lru_cache(maxsize=None)
+def _generated(gen, name):
+    """Generate a fixture with the given generator once per test session."""
+    structs, services = _fixture(name)
+    output = gen.generate(structs, services)
+    _SUFFIX_INDEXES[id(output)] = _build_suffix_index(output)
+    return output
+
+
+class _CodegenTestBase(unittest.TestCase):
+    """Shared lookup and assertion helpers for the codegen tests."""
 
     def get_file(self, output, path_suffix):
-        """Find a file in the output dict by suffix match."""
-        norm_suffix = os.path.normpath(path_suffix)
-        for k in output:
-            if os.path.normpath(k).endswith(norm_suffix):
-                return output[k]
+        """Find a file in the output dict by path-suffix match."""
+        index = _SUFFIX_INDEXES.get(id(output))
+        if index is None:
+            index = _build_suffix_index(output)
+        suffix = _query_path(path_suffix)
+        if suffix in index:
+            return index[suffix]
         raise KeyError(f"Path suffix '{path_suffix}' not found in {list(output.keys())}")
 
+    def assertAllIn(self, needles, content):
+        """Assert every needle occurs in content, reporting all missing ones at once."""
+        missing = [n for n in needles if n not in content]
+        self.assertFalse(missing, f"Missing from generated output: {missing}")
+
+
+class TestGenerators(_CodegenTestBase):
+    """Tests for code generators using model objects directly (no parser dependency)."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Imported here so parser-only runs (e.g. -k parser) never load the
+        # generator modules. Generators are stateless, so one instance of
+        # each serves every test.
+        from tools.codegen.generators.rust import RustGenerator
+        from tools.codegen.generators.python import PythonGenerator
+        from tools.codegen.generators.cpp import CppGenerator
+        cls.rust_gen = RustGenerator()
+        cls.py_gen = PythonGenerator()
+        cls.cpp_gen = CppGenerator()
+
+    def generate(self, gen, model_name):
+        """Return gen's output for a named fixture (shared across the session)."""
+        return _generated(gen, model_name)
+
     # --- Rust Generator ---
 
     def test_rust_generator_basic(self):
-        structs, services = _make_simple_service()
-        output = self.rust_gen.generate(structs, services)
+        output = self.generate(self.rust_gen, 'simple')
         # New generator produces per-service files + mod.rs
         mod_content = self.get_file(output, "rust/mod.rs")
         self.assertIn("pub mod", mod_content)
@@ -86,96 +201,222 @@ class TestGenerators(unittest.TestCase):
         self.assertIn("pub struct MyStruct", types_content)
         # Check service file
         svc_content = self.get_file(output, "rust/my_service.rs")
-        self.assertIn("pub trait MyServiceProvider", svc_content)
-        self.assertIn("pub struct MyServiceServer", svc_content)
-        self.assertIn("pub struct MyServiceClient", svc_content)
+        self.assertAllIn([
+            "pub trait MyServiceProvider",
+            "pub struct MyServiceServer",
+            "pub struct MyServiceClient",
+        ], svc_content)
 
     def test_rust_recursive_type(self):
-        structs, services = _make_recursive_types()
-        output = self.rust_gen.generate(structs, services)
+        output = self.generate(self.rust_gen, 'recursive')
         types_content = self.get_file(output, "rust/types.rs")
-        self.assertIn("pub struct PathCollection", types_content)
-        self.assertIn("Vec<Vec<Point>>", types_content)
+        self.assertAllIn(["pub struct PathCollection", "Vec<Vec<Point>>"], types_content)
 
     def test_rust_primitives(self):
-        structs, services = _make_all_primitives()
-        output = self.rust_gen.generate(structs, services)
+        output = self.generate(self.rust_gen, 'primitives')
         types_content = self.get_file(output, "rust/types.rs")
-        self.assertIn("i32", types_content)   # int
-        self.assertIn("f32", types_content)   # float
-        self.assertIn("bool", types_content)  # bool
-        self.assertIn("String", types_content)  # str
+        self.assertAllIn([
+            "i32",     # int
+            "f32",     # float
+            "bool",    # bool
+            "String",  # str
+        ], types_content)
 
     def test_rust_rpc_methods(self):
-        structs, services = _make_rpc_service()
-        output = self.rust_gen.generate(structs, services)
+        output = self.generate(self.rust_gen, 'rpc')
+        svc_content = self.get_file(output, "rust/math_service.rs")
+        self.assertAllIn(["pub fn add", "pub fn fire_and_forget"], svc_content)
+
+    def test_rust_shared_signature_alias(self):
+        output = self.generate(self.rust_gen, 'shared')
         svc_content = self.get_file(output, "rust/math_service.rs")
-        self.assertIn("pub fn add", svc_content)
-        self.assertIn("pub fn fire_and_forget", svc_content)
+        self.assertAllIn([
+            "pub struct MathServiceAddRequest",
+            "pub type MathServiceSubRequest = MathServiceAddRequest;",
+            "pub type MathServiceSubResponse = MathServiceAddResponse;",
+        ], svc_content)
+        self.assertNotIn("pub struct MathServiceSubRequest", svc_content)
+
+    def test_rust_buffer_capacities(self):
+        output = self.generate(self.rust_gen, 'sized')
+        svc_content = self.get_file(output, "rust/sized_service.rs")
+        # Server responses are pre-sized from the return type
+        add_arm = svc_content.split("METHOD_ADD => {", 1)[1].split("},", 1)[0]
+        self.assertIn("Vec::with_capacity(4);", add_arm)
+        # Client requests are pre-sized from the arguments; the recursive
+        # Node.next counts as 0, so link() stops at the i32 value.
+        for method, capacity in (("ping", 0), ("add", 8), ("link", 4)):
+            body = svc_content.split(f"    pub fn {method}(&self", 1)[1].split("\n    }", 1)[0]
+            self.assertIn(f"let mut payload = Vec::with_capacity({capacity});", body, method)
+            self.assertIn("Vec::with_capacity(header_bytes.len() + payload.len());", body, method)
 
     # --- Python Generator ---
 
     def test_python_generator_basic(self):
-        structs, services = _make_simple_service()
-        output = self.py_gen.generate(structs, services)
+        output = self.generate(self.py_gen, 'simple')
         bindings = self.get_file(output, "python/bindings.py")
         self.assertIn("class MyStruct", bindings)
         runtime = self.get_file(output, "python/runtime.py")
-        self.assertIn("class MyServiceStub", runtime)
-        self.assertIn("class MyServiceClient", runtime)
+        self.assertAllIn(["class MyServiceStub", "class MyServiceClient"], runtime)
 
     def test_python_recursive_type(self):
-        structs, services = _make_recursive_types()
-        output = self.py_gen.generate(structs, services)
+        output = self.generate(self.py_gen, 'recursive')
         content = self.get_file(output, "python/bindings.py")
-        self.assertIn("class PathCollection", content)
-        self.assertIn("for _item in", content)
+        self.assertAllIn(["class PathCollection", "for _item in"], content)
 
     def test_python_sync_rpc(self):
-        structs, services = _make_rpc_service()
-        output = self.py_gen.generate(structs, services)
+        output = self.generate(self.py_gen, 'rpc')
         runtime = self.get_file(output, "python/runtime.py")
-        self.assertIn("wait_for_response=True", runtime)
-        self.assertIn("wait_for_response=False", runtime)
+        self.assertAllIn(["wait_for_response=True", "wait_for_response=False"], runtime)
+
+    def test_python_shared_signature_alias(self):
+        output = self.generate(self.py_gen, 'shared')
+        bindings = self.get_file(output, "python/bindings.py")
+        self.assertAllIn([
+            "class MathServiceAddRequest",
+            "MathServiceSubRequest = MathServiceAddRequest",
+            "MathServiceSubResponse = MathServiceAddResponse",
+        ], bindings)
+        self.assertNotIn("class MathServiceSubRequest", bindings)
+
+    def _load_bindings(self, model_name):
+        """Exec the generated Python bindings for a fixture; returns their namespace."""
+        namespace = {}
+        exec(self.get_file(self.generate(self.py_gen, model_name), "python/bindings.py"), namespace)
+        return namespace
+
+    def test_python_primitive_list_round_trip(self):
+        lists_cls = self._load_bindings('lists')['PrimitiveLists']
+        obj = lists_cls(
+            ints=[1, -2, 3], nested=[[1], [2, 3], []], floats=[1.5, None],
+            flags=[True, False, True], longs=[2 ** 40, -1],
+        )
+        decoded = lists_cls.deserialize(obj.serialize())
+        self.assertEqual(decoded.ints, [1, -2, 3])
+        self.assertEqual(decoded.nested, [[1], [2, 3], []])
+        self.assertEqual(decoded.floats, [1.5, 0.0])  # None encodes as the default
+        self.assertEqual(decoded.flags, [True, False, True])
+        self.assertEqual(decoded.longs, [2 ** 40, -1])
+
+    def test_python_primitive_list_rejects_partial_element(self):
+        namespace = self._load_bindings('lists')
+        lists_cls = namespace['PrimitiveLists']
+        # Valid message except that "ints" claims 6 bytes: an int32 and a half
+        rest = lists_cls(ints=[]).serialize()[4:]
+        data = namespace['_S_U32'].pack(6) + bytes(6) + rest
+        with self.assertRaises(namespace['struct'].error):
+            lists_cls.deserialize(data)
 
     # --- C++ Generator ---
 
     def test_cpp_generator_basic(self):
-        structs, services = _make_simple_service()
-        output = self.cpp_gen.generate(structs, services)
+        output = self.generate(self.cpp_gen, 'simple')
         # New generator produces per-service headers + types.h + bindings.h
         types_content = self.get_file(output, "cpp/types.h")
-        self.assertIn("struct MyStruct", types_content)
-        self.assertIn("int32_t a;", types_content)
-        self.assertIn("std::string b;", types_content)
+        self.assertAllIn(["struct MyStruct", "int32_t a;", "std::string b;"], types_content)
 
     def test_cpp_recursive_type(self):
-        structs, services = _make_recursive_types()
-        output = self.cpp_gen.generate(structs, services)
+        output = self.generate(self.cpp_gen, 'recursive')
         types_content = self.get_file(output, "cpp/types.h")
-        self.assertIn("struct PathCollection", types_content)
-        self.assertIn("std::vector<std::vector<Point>>", types_content)
+        self.assertAllIn(["struct PathCollection", "std::vector<std::vector<Point>>"], types_content)
 
     def test_cpp_primitives(self):
-        structs, services = _make_all_primitives()
-        output = self.cpp_gen.generate(structs, services)
+        output = self.generate(self.cpp_gen, 'primitives')
         types_content = self.get_file(output, "cpp/types.h")
-        self.assertIn("int32_t", types_content)
-        self.assertIn("float", types_content)
-        self.assertIn("bool", types_content)
-        self.assertIn("std::string", types_content)
+        self.assertAllIn(["int32_t", "float", "bool", "std::string"], types_content)
+
+
+class TestWriteIfChanged(unittest.TestCase):
+    """Tests for codegen's write-only-on-change output helper."""
+
+    def setUp(self):
+        from tools.codegen.main import _write_if_changed
+        self.write = _write_if_changed
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "out.rs")
+
+    def test_unchanged_content_keeps_mtime(self):
+        self.assertTrue(self.write(self.path, b"fn main() {}\n"))
+        # Backdate the file so a rewrite could not land on the same timestamp
+        os.utime(self.path, ns=(1_000_000_000, 1_000_000_000))
+        self.assertFalse(self.write(self.path, b"fn main() {}\n"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1_000_000_000)
+
+    def test_changed_content_is_replaced(self):
+        self.write(self.path, b"old")
+        self.assertTrue(self.write(self.path, b"new"))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"new")
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_failed_write_removes_temp_file(self):
+        self.write(self.path, b"old")
+        with mock.patch("tools.codegen.main.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.write(self.path, b"new")
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"old")
+
+
+class TestMainProjects(unittest.TestCase):
+    """Tests for the --project argument handling of tools.codegen.main."""
+
+    IA = "integrated_apps:examples.integrated_apps.idl"
+    AP = "automotive_pubsub:examples.automotive_pubsub.idl"
+
+    def setUp(self):
+        from tools.codegen.main import main
+        self.main = main
+        # main() resolves IDL modules against the cwd, like the build does
+        cwd = os.getcwd()
+        os.chdir(os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")))
+        self.addCleanup(os.chdir, cwd)
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.out = tmp_dir.name
+
+    def run_main(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            self.main(list(argv))
+
+    def read(self, *parts):
+        with open(os.path.join(self.out, *parts), "rb") as f:
+            return f.read()
+
+    def test_multi_project_matches_single_project_runs(self):
+        self.run_main("--project", self.IA, "--project", self.AP,
+                      "--lang", "python", "--output-dir", os.path.join(self.out, "multi"))
+        for spec in (self.IA, self.AP):
+            name, _, module = spec.partition(":")
+            self.run_main("--project", name, "--module", module,
+                          "--lang", "python", "--output-dir", os.path.join(self.out, "single"))
+            for rel in ("bindings.py", "runtime.py"):
+                self.assertEqual(self.read("multi", name, "python", rel),
+                                 self.read("single", name, "python", rel), f"{name}/{rel}")
+
+    def test_rejected_project_combinations(self):
+        for argv in (
+            ["--project", self.IA, "--project", "automotive_pubsub"],
+            ["--project", self.IA, "--module", "examples.automotive_pubsub.idl"],
+            ["--project", "integrated_apps", "--project", "automotive_pubsub",
+             "--module", "examples.integrated_apps.idl"],
+        ):
+            with self.subTest(argv=argv), self.assertRaises(SystemExit):
+                self.run_main(*argv, "--output-dir", self.out)
+        # Nothing may be generated for a rejected command line
+        self.assertEqual(os.listdir(self.out), [])
 
 
 # Keep a legacy test for the AST parser if it still exists
 try:
     from tools.codegen.parser import PythonASTParser
 
-    class TestASTParser(unittest.TestCase):
+    class TestASTParser(_CodegenTestBase):
         """Tests for the legacy AST parser (kept for backward compat)."""
 
-        def setUp(self):
-            self.parser = PythonASTParser()
-            self.test_idl = """
+        test_idl = """
 import dataclasses
 from typing import List
 
@@ -198,21 +439,34 @@ class MyService:
     def my_method(self, val: int) -> int:
         pass
 """
-            self.tmp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.py')
-            self.tmp_file.write(self.test_idl)
-            self.tmp_file.close()
 
-        def tearDown(self):
-            os.unlink(self.tmp_file.name)
+        @classmethod
+        def setUpClass(cls):
+            # Parse once per class; the tests only read the resulting models
+            cls.parser = PythonASTParser()
+            # Parse the source once; tests re-walk the shared tree as needed
+            cls.tree = ast.parse(cls.test_idl)
+            cls.structs, cls.services = cls.parser.parse_tree(cls.tree)
 
         def test_parser(self):
-            structs, services = self.parser.parse(self.tmp_file.name)
+            structs, services = self.structs, self.services
             self.assertEqual(len(structs), 1)
             self.assertEqual(structs[0].name, "MyStruct")
             self.assertEqual(len(services), 1)
             self.assertEqual(services[0].name, "MyService")
             self.assertEqual(services[0].id, 0x1234)
 
+        def test_parse_tree_is_reusable(self):
+            self.assertEqual(self.parser.parse_tree(self.tree), (self.structs, self.services))
+            self.assertEqual(self.parser.parse_source(self.test_idl), (self.structs, self.services))
+
+        def test_parse_file_matches_source(self):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                idl_path = pathlib.Path(tmp_dir) / "idl.py"
+                idl_path.write_text(self.test_idl)
+                self.assertEqual(self.parser.parse(str(idl_path)),
+                                 (self.structs, self.services))
+
 except ImportError:
     pass  # AST parser removed — that's fine
 
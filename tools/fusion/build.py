@@ -1,30 +1,111 @@
+import collections
+import datetime
+import hashlib
+import shutil
 import subprocess
 import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 class Builder:
+    # Touched after a successful build_rust; newer than every manifest means
+    # all crates are already in the local registry cache.
+    CARGO_LOCK_STAMP = os.path.join("target", ".fusion_lock_stamp")
+    CARGO_MANIFESTS = [
+        "Cargo.lock",
+        "Cargo.toml",
+        "examples/integrated_apps/rust_app/Cargo.toml",
+        "examples/automotive_pubsub/rust_fusion/Cargo.toml",
+    ]
+
     def __init__(self, reporter):
         self.reporter = reporter
+        # Resolve the toolchain once per Builder. On Windows the absolute
+        # npm.cmd path also runs without shell=True. An unresolved name is
+        # kept as-is, so run_command still reports it as not found.
+        npm = "npm.cmd" if os.name == "nt" else "npm"
+        self._npm = shutil.which(npm) or npm
+        self._cargo = shutil.which("cargo") or "cargo"
+        self._cmake = shutil.which("cmake") or "cmake"
+        self.verbose = os.environ.get("FUSION_VERBOSE") == "1"
+        # Builds run on several threads; keep multi-line output in one piece
+        self._print_lock = threading.Lock()
 
-    def run_command(self, cmd, log_name, cwd=None):
+    def run_command(self, cmd, log_name, cwd=None, env=None):
         log_path = self.reporter.get_log_path(log_name)
-        print(f"Running: {' '.join(cmd)} > {log_name}.log")
-        
-        with open(log_path, "w") as f:
+        if self.verbose:
+            with self._print_lock:
+                print(f"Running: {' '.join(cmd)} > {log_name}.log")
+
+        # Keep the last lines in memory so a failure can be reported
+        # without re-reading the (possibly large) log from disk.
+        tail = collections.deque(maxlen=2048)
+        # Output arrives line by line; a large buffer batches the log writes.
+        with open(log_path, "w", encoding="utf-8", buffering=65536) as f:
             try:
-                proc = subprocess.run(cmd, stdout=f, stderr=subprocess.STDOUT, cwd=cwd, check=True)
-                return True
-            except subprocess.CalledProcessError:
-                f.flush()
-                with open(log_path, "r") as log_file:
-                    print(f"--- FAILURE LOG: {log_name} ---")
-                    print(log_file.read())
-                    print(f"--- END LOG ---")
-                return False
+                proc = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    cwd=cwd,
+                    env=env,
+                    text=True,
+                    bufsize=1,
+                    encoding="utf-8",
+                    errors="replace",
+                )
             except FileNotFoundError as e:
                 f.write(f"\n[ERROR] Command not found: {e}\n")
-                print(f"[ERROR] Command not found: {e}")
+                with self._print_lock:
+                    print(f"[ERROR] Command not found: {e}")
                 return False
 
+            with proc:
+                for line in proc.stdout:
+                    f.write(line)
+                    tail.append(line)
+
+            if proc.returncode != 0:
+                with self._print_lock:
+                    print(f"--- FAILURE LOG: {log_name} ---")
+                    print("".join(tail))
+                    print("--- END LOG ---")
+                return False
+            return True
+
+    def run_in_process(self, main, argv, log_name):
+        """Call main(argv, out) in this interpreter, logging like run_command.
+
+        main writes its progress to the log file passed as out; sys.stdout
+        is left alone, so other build threads keep printing to the console.
+        """
+        log_path = self.reporter.get_log_path(log_name)
+        if self.verbose:
+            with self._print_lock:
+                print(f"Running: {main.__module__}.{main.__name__} {' '.join(argv)} > {log_name}.log")
+
+        with open(log_path, "w", encoding="utf-8") as f:
+            ok = True
+            try:
+                main(argv, f)
+            except SystemExit as e:
+                # argparse reports usage errors this way
+                ok = e.code in (None, 0)
+            except Exception:
+                traceback.print_exc(file=f)
+                ok = False
+
+        if not ok:
+            # In-process steps log little, so the whole file is the tail
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                log = f.read()
+            with self._print_lock:
+                print(f"--- FAILURE LOG: {log_name} ---")
+                print(log)
+                print("--- END LOG ---")
+        return ok
+
     def generate_bindings(self):
         import sys
 
@@ -34,87 +115,76 @@ class Builder:
             ("automotive_pubsub", "examples.automotive_pubsub.idl"),
         ]
 
-        # IDL package directories for timestamp tracking
+        # IDL package directories for change tracking. The generator
+        # itself is tracked too, so template changes reach the outputs.
         idl_dirs = [
             "examples/integrated_apps/idl",
             "examples/automotive_pubsub/idl",
             "examples/versioning_demo/interface.py",
+            "tools/codegen",
         ]
 
         output_dir = "build/generated"
-        marker_file = os.path.join(output_dir, ".codegen_timestamp")
+        # SHA-256 of the tracked sources at the last successful run
+        marker_file = os.path.join(output_dir, ".codegen_hash")
+
+        # One entry file per language; a missing one means the project's
+        # outputs were removed after the marker was written.
+        expected_outputs = [
+            os.path.join(output_dir, project_name, rel)
+            for project_name, _ in projects
+            for rel in ("rust/mod.rs", "cpp/bindings.h", "ts/index.ts", "python/bindings.py")
+        ]
 
-        # Check if we should regenerate
+        # Check if we should regenerate. The marker's mtime is a cheap
+        # first filter; only a newer source triggers hashing, and a source
+        # that was merely touched (checkout, IDE save) does not regenerate.
         regenerate = False
+        digest = None
         if not os.path.exists(marker_file):
             print("[codegen] Marker file not found. Regenerating...")
             regenerate = True
+        elif not all(os.path.exists(p) for p in expected_outputs):
+            print("[codegen] Generated outputs missing. Regenerating...")
+            regenerate = True
         else:
             try:
-                marker_mtime = os.path.getmtime(marker_file)
-                for idl_path in idl_dirs:
-                    abs_path = os.path.abspath(idl_path)
-                    if os.path.isdir(abs_path):
-                        for root, _, files in os.walk(abs_path):
-                            for fname in files:
-                                if fname.endswith(".py"):
-                                    fpath = os.path.join(root, fname)
-                                    if os.path.getmtime(fpath) > marker_mtime:
-                                        print(f"[codegen] {fpath} changed. Regenerating...")
-                                        regenerate = True
-                                        break
-                            if regenerate:
-                                break
-                    elif os.path.exists(abs_path):
-                        if os.path.getmtime(abs_path) > marker_mtime:
-                            print(f"[codegen] {idl_path} changed. Regenerating...")
+                changed = self._has_newer(idl_dirs, os.path.getmtime(marker_file))
+                if changed:
+                    digest = self._hash_sources(idl_dirs)
+                    with open(marker_file) as f:
+                        if f.read().strip() != digest:
+                            print(f"[codegen] {changed} changed. Regenerating...")
                             regenerate = True
-                    if regenerate:
-                        break
+                    if not regenerate:
+                        # Refresh the mtime so the next run stays on the fast path
+                        self._write_marker(marker_file, digest)
             except Exception as e:
-                print(f"[codegen] Error checking timestamps: {e}. Regenerating...")
+                print(f"[codegen] Error checking sources: {e}. Regenerating...")
                 regenerate = True
 
         if not regenerate:
             print("[codegen] Bindings are up-to-date. Skipping generation.")
             return True
 
-        # Generate per-project bindings (Rust + C++ + TS)
-        success = True
+        # Hash before generating, so an edit made while codegen runs is
+        # picked up by the next build.
+        if digest is None:
+            digest = self._hash_sources(idl_dirs)
+
+        # One in-process run scans both projects and emits every language,
+        # so no interpreter start-up is paid and the imports are shared.
+        from tools.codegen import main as codegen
+        argv = []
         for project_name, module_path in projects:
-            cmd = [
-                sys.executable, "-m", "tools.codegen.main",
-                "--project", project_name,
-                "--lang", "rust", "cpp", "ts",
-                "--module", module_path,
-                "--output-dir", output_dir,
-            ]
-            if not self.run_command(cmd, f"codegen_{project_name}"):
-                success = False
-                break
-
-        # Also generate Python stubs for backward compat (python_app still uses them)
-        if success:
-            for project_name, module_path in projects:
-                cmd = [
-                    sys.executable, "-m", "tools.codegen.main",
-                    "--project", project_name,
-                    "--lang", "python",
-                    "--module", module_path,
-                    "--output-dir", output_dir,
-                ]
-                # Non-fatal: Python apps will migrate to zero-codegen
-                self.run_command(cmd, f"codegen_{project_name}_python")
+            argv += ["--project", f"{project_name}:{module_path}"]
+        # Python stubs are kept for backward compat (python_app still uses them)
+        argv += ["--lang", "rust", "cpp", "ts", "python", "--output-dir", output_dir]
+        success = self.run_in_process(codegen.main, argv, "codegen")
 
         if success:
-            try:
-                if not os.path.exists(output_dir):
-                    os.makedirs(output_dir)
-                with open(marker_file, "w") as f:
-                    import datetime
-                    f.write(str(datetime.datetime.now()))
-            except Exception as e:
-                print(f"[codegen] Warning: Could not update marker: {e}")
+            os.makedirs(output_dir, exist_ok=True)
+            self._write_marker(marker_file, digest)
 
             # Generate per-project config.json files
             cmd_configs = [sys.executable, "-m", "tools.fusion.generate_configs"]
@@ -122,25 +192,76 @@ class Builder:
 
         return success
 
+    def build_all(self, rust=True, cpp=True, js=True, with_coverage=False, packet_dump=False):
+        """Run the requested language builds concurrently.
+
+        Cargo, CMake and npm use separate toolchains and output trees, so they
+        overlap instead of queueing; run generate_bindings first, since all of
+        them consume its output. The Rust crates share one workspace target
+        dir and stay sequential inside build_rust.
+
+        Returns the names of the failed builds, in Rust, C++, JS order.
+        """
+        builds = []
+        if rust:
+            builds.append(("Rust", lambda: self.build_rust(packet_dump)))
+        if cpp:
+            builds.append(("C++", lambda: self.build_cpp(with_coverage, packet_dump)))
+        if js:
+            builds.append(("JS", self.build_js))
+        if not builds:
+            return []
+
+        with ThreadPoolExecutor(max_workers=len(builds)) as pool:
+            results = list(pool.map(lambda b: b[1](), builds))
+        return [name for (name, _), ok in zip(builds, results) if not ok]
+
     def build_rust(self, packet_dump=False):
+        # The root crate and both demos are one Cargo workspace, so they already
+        # share target/ and its compiled dependencies. sccache additionally
+        # reuses rustc outputs across clean builds and checkouts.
+        env = None
+        if "RUSTC_WRAPPER" not in os.environ and shutil.which("sccache"):
+            env = dict(os.environ, RUSTC_WRAPPER="sccache")
+
+        # Once a build has succeeded with the current lockfile and manifests,
+        # every dependency is in the local registry cache; skip the index check.
+        deps_cached = self._stamp_is_current(self.CARGO_LOCK_STAMP, self.CARGO_MANIFESTS)
+        lock_flags = ["--offline", "--frozen"] if deps_cached else []
+
         # Core + simple bins
-        cmd = ["cargo", "build", "--examples", "--bins"]
+        cmd = [self._cargo, "build", "--examples", "--bins", *lock_flags]
         if packet_dump:
             cmd.extend(["--features", "packet-dump"])
             
-        if not self.run_command(cmd, "build_rust_core"):
+        if not self.run_command(cmd, "build_rust_core", env=env):
             return False
         
         # Standalone Demo
-        cmd_demo = ["cargo", "build"]
+        cmd_demo = [self._cargo, "build", *lock_flags]
         if packet_dump:
             cmd_demo.extend(["--features", "packet-dump"])
             
-        if not self.run_command(cmd_demo, "build_rust_demo", cwd="examples/integrated_apps/rust_app"):
+        if not self.run_command(cmd_demo, "build_rust_demo", cwd="examples/integrated_apps/rust_app", env=env):
             return False
 
         # Automotive Pub-Sub Fusion Node
-        return self.run_command(cmd_demo, "build_rust_fusion", cwd="examples/automotive_pubsub/rust_fusion")
+        if not self.run_command(cmd_demo, "build_rust_fusion", cwd="examples/automotive_pubsub/rust_fusion", env=env):
+            return False
+
+        if not deps_cached:
+            self._touch_stamp(self.CARGO_LOCK_STAMP)
+        return True
+
+    def fetch_rust(self):
+        """Download the workspace crates ahead of build_rust.
+
+        The download is network-bound, so callers overlap it with codegen.
+        A failure is not fatal here; build_rust reports it properly.
+        """
+        if self._stamp_is_current(self.CARGO_LOCK_STAMP, self.CARGO_MANIFESTS):
+            return True
+        return self.run_command([self._cargo, "fetch"], "build_rust_fetch")
 
     def build_cpp(self, with_coverage=False, packet_dump=False):
         # Core Library + Simple Bins + Tests (Root CMake)
@@ -150,30 +271,61 @@ class Builder:
         if os.name != 'nt':
             build_dir = "build_linux"
             
-        if not os.path.exists(build_dir):
-            os.makedirs(build_dir)
-            
-        cmake_config = ["cmake", "..", "-DCMAKE_BUILD_TYPE=Release"]
-        if with_coverage:
-            cmake_config.append("-DFUSION_ENABLE_COVERAGE=ON")
-        if packet_dump:
-            cmake_config.append("-DFUSION_PACKET_DUMP=ON")
+        os.makedirs(build_dir, exist_ok=True)
             
-        if not self.run_command(cmake_config, "build_cpp_config", cwd=build_dir):
-            return False
+        # Options are always passed explicitly: CMake keeps a cached ON
+        # when a later configure simply omits the flag.
+        cmake_config = [self._cmake, "..", "-DCMAKE_BUILD_TYPE=Release",
+                        f"-DFUSION_ENABLE_COVERAGE={'ON' if with_coverage else 'OFF'}",
+                        f"-DFUSION_PACKET_DUMP={'ON' if packet_dump else 'OFF'}"]
+
+        cache = os.path.join(build_dir, "CMakeCache.txt")
+        config_hash_file = os.path.join(build_dir, ".fusion_config_hash")
+        config_hash = hashlib.sha256(repr(sorted(cmake_config[1:])).encode()).hexdigest()
+        if self._cmake_cache_is_current(cache, config_hash_file, config_hash):
+            print(f"[build_cpp] {cache} is up-to-date. Skipping configure.")
+        else:
+            # The generator is fixed when a build dir is first configured;
+            # CMake rejects a different -G on an existing cache.
+            if not os.path.exists(cache) and shutil.which("ninja"):
+                cmake_config.extend(["-G", "Ninja"])
+            if not self.run_command(cmake_config, "build_cpp_config", cwd=build_dir):
+                return False
+            try:
+                with open(config_hash_file, "w") as f:
+                    f.write(config_hash)
+            except OSError as e:
+                print(f"[WARN] Could not write {config_hash_file}: {e}")
             
-        cmake_build = ["cmake", "--build", ".", "--config", "Release"]
+        # Without a job count the default generators compile one TU at a time
+        cmake_build = [self._cmake, "--build", ".", "--config", "Release",
+                       "--parallel", str(os.cpu_count() or 2)]
         if not self.run_command(cmake_build, "build_cpp_compile", cwd=build_dir):
             return False
             
         return True
 
+    @staticmethod
+    def _cmake_cache_is_current(cache, config_hash_file, config_hash):
+        """True if cache is newer than the top-level CMake sources and was
+        configured with the flag set hashed in config_hash.
+
+        The generated build system re-runs configure by itself when a
+        nested CMakeLists.txt changes, so only the entry points are checked.
+        """
+        inputs = ["CMakeLists.txt"]
+        if os.path.isdir("cmake"):
+            inputs += [os.path.join("cmake", n) for n in os.listdir("cmake") if n.endswith(".cmake")]
+        if not Builder._stamp_is_current(cache, inputs):
+            return False
+        try:
+            with open(config_hash_file) as f:
+                return f.read().strip() == config_hash
+        except OSError:
+            return False
+
     def build_js(self):
         """Builds all JS/TS projects (core and examples)."""
-        npm_bin = "npm.cmd" if os.name == "nt" else "npm"
-        
-        import shutil
-
         js_projects = [
             ("src/js", None),
             ("examples/integrated_apps/js_app", "integrated_apps"),
@@ -181,42 +333,163 @@ class Builder:
             ("examples/simple_no_sd/js", None),
             ("examples/someipy_demo/js_client", None) # Uses manual or no bindings for now?
         ]
+
+        # The examples depend on the core package (file:../../../src/js), so
+        # it is built first; the examples share no state and build side by side.
+        core, examples = js_projects[0], js_projects[1:]
+        if not self._build_js_project(*core):
+            return False
+        with ThreadPoolExecutor(max_workers=len(examples)) as pool:
+            return all(list(pool.map(lambda p: self._build_js_project(*p), examples)))
+
+    def _build_js_project(self, project_path, codegen_project):
+        """Install and build one JS/TS project; returns False on failure."""
+        full_path = os.path.join(os.getcwd(), project_path)
+        if not os.path.exists(full_path):
+            print(f"[WARN] JS Project path not found: {project_path}")
+            return True
         
-        for project_path, codegen_project in js_projects:
-            full_path = os.path.join(os.getcwd(), project_path)
-            if not os.path.exists(full_path):
-                print(f"[WARN] JS Project path not found: {project_path}")
-                continue
+        # Copy generated bindings if applicable
+        if codegen_project:
+            generated_src = os.path.join("build", "generated", codegen_project, "ts")
+            target_dest = os.path.join(full_path, "src", "generated")
             
-            # Copy generated bindings if applicable
-            if codegen_project:
-                generated_src = os.path.join("build", "generated", codegen_project, "ts")
-                target_dest = os.path.join(full_path, "src", "generated")
-                
-                if os.path.exists(generated_src):
-                    print(f"[build_js] Copying generated bindings: {generated_src} -> {target_dest}")
-                    if os.path.exists(target_dest):
-                         shutil.rmtree(target_dest)
-                    shutil.copytree(generated_src, target_dest)
-                else:
-                    print(f"[WARN] Generated bindings not found at {generated_src}. Build may fail.")
-
-            # Skip if no package.json (e.g. simple vanilla JS files)
-            pkg_json = os.path.join(full_path, "package.json")
-            if not os.path.exists(pkg_json):
-                print(f"Skipping JS build for {project_path} (no package.json)")
-                continue
-                
-            log_suffix = project_path.replace("/", "_").replace("\\", "_")
-            print(f"Building JS project: {project_path}")
+            if os.path.exists(generated_src):
+                print(f"[build_js] Copying generated bindings: {generated_src} -> {target_dest}")
+                if os.path.exists(target_dest):
+                     shutil.rmtree(target_dest)
+                shutil.copytree(generated_src, target_dest)
+            else:
+                print(f"[WARN] Generated bindings not found at {generated_src}. Build may fail.")
+
+        # Skip if no package.json (e.g. simple vanilla JS files)
+        pkg_json = os.path.join(full_path, "package.json")
+        if not os.path.exists(pkg_json):
+            print(f"Skipping JS build for {project_path} (no package.json)")
+            return True
             
-            # Install
-            if not self.run_command([npm_bin, "install"], f"build_js_install_{log_suffix}", cwd=project_path):
-                return False
-                
-            # Build (only if package.json has a build script)
-            # Most of our JS projects have a build script for tsc
-            if not self.run_command([npm_bin, "run", "build"], f"build_js_compile_{log_suffix}", cwd=project_path):
+        log_suffix = project_path.replace("/", "_").replace("\\", "_")
+        stamp = os.path.join(full_path, "node_modules", ".install_stamp")
+        lock = os.path.join(full_path, "package-lock.json")
+
+        # Skip install and tsc when nothing that feeds dist/ changed since the
+        # last successful build. Examples also track the core package's build.
+        build_stamp = os.path.join(full_path, "dist", ".fusion_build_stamp")
+        build_inputs = [os.path.join(full_path, "src"), pkg_json, lock,
+                        os.path.join(full_path, "tsconfig.json")]
+        if project_path != "src/js":
+            build_inputs.append(os.path.join("src", "js", "dist", ".fusion_build_stamp"))
+        try:
+            build_current = (os.path.exists(stamp) and
+                             not self._has_newer(build_inputs, os.path.getmtime(build_stamp), suffix=None))
+        except OSError:
+            build_current = False
+        if build_current:
+            print(f"[build_js] {project_path}: up-to-date. Skipping build.")
+            return True
+
+        print(f"Building JS project: {project_path}")
+        
+        # Install, unless node_modules was populated after the manifests last changed
+        if self._stamp_is_current(stamp, [pkg_json, lock]):
+            print(f"[build_js] {project_path}: dependencies up-to-date")
+        else:
+            # npm ci installs exactly what the lockfile pins, without
+            # reconciling it; audit and funding lookups are network round-trips.
+            if os.path.exists(lock):
+                install = [self._npm, "ci", "--prefer-offline", "--no-audit", "--no-fund"]
+            else:
+                install = [self._npm, "install", "--no-audit", "--no-fund"]
+            if not self.run_command(install, f"build_js_install_{log_suffix}", cwd=project_path):
                 return False
-                
+            self._touch_stamp(stamp)
+            
+        # Build (only if package.json has a build script)
+        # Most of our JS projects have a build script for tsc
+        if not self.run_command([self._npm, "run", "build"], f"build_js_compile_{log_suffix}", cwd=project_path):
+            return False
+        self._touch_stamp(build_stamp)
         return True
+
+    @staticmethod
+    def _has_newer(paths, mtime, suffix=".py"):
+        """Return the first file under paths modified after mtime, or None.
+
+        Only names ending in suffix count inside directories (None: any file).
+        Plain files in paths are checked directly; directories are scanned
+        recursively. os.scandir reuses the directory listing for the type
+        check, and the scan stops at the first hit.
+        """
+        for path in paths:
+            if os.path.isdir(path):
+                stack = [path]
+                while stack:
+                    with os.scandir(stack.pop()) as it:
+                        for entry in it:
+                            if entry.is_dir():
+                                stack.append(entry.path)
+                            elif ((suffix is None or entry.name.endswith(suffix))
+                                  and entry.stat().st_mtime > mtime):
+                                return entry.path
+            elif os.path.exists(path) and os.path.getmtime(path) > mtime:
+                return path
+        return None
+
+    @staticmethod
+    def _hash_sources(paths):
+        """SHA-256 over the relative path and bytes of every .py file in paths.
+
+        Entries are visited in sorted order, so the digest only depends on
+        the file names and their contents.
+        """
+        h = hashlib.sha256()
+        for path in paths:
+            if os.path.isdir(path):
+                files = []
+                stack = [path]
+                while stack:
+                    with os.scandir(stack.pop()) as it:
+                        for entry in it:
+                            if entry.is_dir():
+                                # Bytecode caches are not sources
+                                if entry.name != "__pycache__":
+                                    stack.append(entry.path)
+                            elif entry.name.endswith(".py"):
+                                files.append(entry.path)
+                files.sort()
+            elif os.path.exists(path):
+                files = [path]
+            else:
+                continue
+            for fpath in files:
+                h.update(fpath.replace(os.sep, "/").encode("utf-8") + b"\0")
+                with open(fpath, "rb") as f:
+                    h.update(f.read())
+                h.update(b"\0")
+        return h.hexdigest()
+
+    @staticmethod
+    def _write_marker(marker_file, digest):
+        try:
+            with open(marker_file, "w") as f:
+                f.write(digest)
+        except OSError as e:
+            print(f"[codegen] Warning: Could not update marker: {e}")
+
+    @staticmethod
+    def _stamp_is_current(stamp, inputs):
+        """True if stamp exists and is newer than every existing input file."""
+        try:
+            stamp_mtime = os.path.getmtime(stamp)
+        except OSError:
+            return False
+        return all(os.path.getmtime(p) <= stamp_mtime for p in inputs if os.path.exists(p))
+
+    @staticmethod
+    def _touch_stamp(stamp):
+        try:
+            os.makedirs(os.path.dirname(stamp), exist_ok=True)
+            with open(stamp, "w") as f:
+                f.write(str(datetime.datetime.now()))
+        except OSError as e:
+            print(f"[WARN] Could not write stamp {stamp}: {e}")
@@ -13,10 +13,26 @@ The low-level ConfigGenerator builder is preserved for custom topologies
 import os
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
 
 logger = logging.getLogger("fusion.config_gen")
 
 
+def _save_all(jobs):
+    """Write several (ConfigGenerator, path) pairs concurrently into existing dirs."""
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        return list(pool.map(lambda job: job[0].save(job[1], ensure_dir=False), jobs))
+
+
 class ConfigGenerator:
     """
     Low-level modular configuration builder for Fusion SOME/IP instances.
@@ -30,8 +46,21 @@ class ConfigGenerator:
         }
         self._global_sd = {}
 
+    @classmethod
+    def from_dict(cls, config):
+        """Wraps a complete config dict, taken by reference rather than copied."""
+        gen = cls.__new__(cls)
+        gen.config = config
+        gen._global_sd = {}
+        return gen
+
     def add_interface(self, logical_name, physical_name, endpoints=None, sd=None, server=None):
-        """Adds a network interface definition."""
+        """Adds a network interface definition.
+
+        Endpoints are copied and normalized: "proto" is renamed to
+        "protocol", which defaults to "udp", and "version" is derived
+        from the IP.
+        """
         iface = {
             "name": physical_name,
             "endpoints": {}
@@ -39,14 +68,13 @@ class ConfigGenerator:
         
         if endpoints:
             for name, ep in endpoints.items():
-                iface["endpoints"][name] = ep.copy()
-                if "protocol" not in iface["endpoints"][name] and "proto" in iface["endpoints"][name]:
-                    iface["endpoints"][name]["protocol"] = iface["endpoints"][name].pop("proto")
-                if "protocol" not in iface["endpoints"][name]:
-                    iface["endpoints"][name]["protocol"] = "udp"
-                if "version" not in iface["endpoints"][name]:
-                    ip = iface["endpoints"][name].get("ip", "")
-                    iface["endpoints"][name]["version"] = 6 if ":" in ip else 4
+                ep = iface["endpoints"][name] = ep.copy()
+                if "protocol" not in ep and "proto" in ep:
+                    ep["protocol"] = ep.pop("proto")
+                if "protocol" not in ep:
+                    ep["protocol"] = "udp"
+                if "version" not in ep:
+                    ep["version"] = 6 if ":" in ep.get("ip", "") else 4
         if sd:
             iface["sd"] = sd
         if server:
@@ -82,17 +110,212 @@ class ConfigGenerator:
         if cycle_offer_ms: self._global_sd["cycle_offer_ms"] = cycle_offer_ms
         return self
 
-    def save(self, path):
-        """Saves current configuration to a JSON file."""
-        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(self.config, f, indent=4)
+    def save(self, path, pretty=False, ensure_dir=True):
+        """Saves current configuration to a JSON file.
+
+        Output is compact unless pretty is set; the runtimes do not care,
+        so indentation is only worth paying for when a human reads it.
+        Uses the fastest encoder installed: orjson, then ujson (compact
+        output only), then the stdlib; all of them write the same bytes.
+        Callers writing a batch into a directory they already created can
+        pass ensure_dir=False to skip the per-file makedirs.
+        """
+        if ensure_dir:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Encode fully first: json.dump would issue a write per encoder chunk
+        if orjson is not None:
+            data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2 if pretty else 0)
+        elif pretty:
+            data = json.dumps(self.config, indent=2, ensure_ascii=False).encode("utf-8")
+        elif ujson is not None:
+            # Raw UTF-8 and an unescaped "/", as orjson writes them
+            data = ujson.dumps(self.config, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+        else:
+            data = json.dumps(self.config, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(data)
         return path
 
     def to_dict(self):
         """Returns the config as a dictionary."""
         return self.config
 
+# ─────────────────────────────────────────────────────────
+#  Demo service topology
+# ─────────────────────────────────────────────────────────
+# These depend only on endpoint names, never on resolved IPs, so every
+# generated config references the same objects. They are shared: never
+# mutate them or a config dict built from them.
+
+_PRIMARY_SD_UC_BIND = {"primary": "sd_uc_v4"}
+_OFFER_1S_SD = {"cycle_offer_ms": 1000}
+
+# Integrated Apps
+_IA_RUST_PROVIDING = {
+    "math-service": {"service_id": 4097, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "rust_udp"}},
+    "eco-service": {"service_id": 4098, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "rust_tcp"}},
+    "complex-service": {"service_id": 16385, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "rust_udp"}},
+}
+_IA_RUST_REQUIRED = {
+    "math-client-v2": {"service_id": 4097, "instance_id": 3, "major_version": 2, "find_on": ["primary"]},
+    "math-client-v1-inst2": {"service_id": 4097, "instance_id": 2, "major_version": 1, "find_on": ["primary"]},
+    "sort-client": {"service_id": 12289, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+    "diag-client": {"service_id": 20481, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+    "string-client": {"service_id": 8193, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+}
+_IA_CPP_PROVIDING = {
+    "sort-service": {"service_id": 12289, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "cpp_udp"}},
+    "sensor-service": {"service_id": 24577, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "cpp_udp"}},
+    "math-service": {"service_id": 4097, "instance_id": 2, "major_version": 1, "offer_on": {"primary": "cpp_udp"}},
+}
+_IA_CPP_REQUIRED = {
+    "math-client": {"service_id": 4097, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+    "string-client": {"service_id": 8193, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+}
+_IA_PYTHON_PROVIDING = {
+    "string-service": {"service_id": 8193, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "python_v4_udp"}},
+    "diagnostic-service": {"service_id": 20481, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "python_v4_tcp"}},
+    "math-service": {"service_id": 4097, "instance_id": 3, "major_version": 2, "offer_on": {"primary": "python_v4_tcp"}},
+}
+_IA_PYTHON_REQUIRED = {
+    "math-client": {"service_id": 4097, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+    "eco-client": {"service_id": 4098, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+    "complex-client": {"service_id": 16385, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+    "sort-client": {"service_id": 12289, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+    "sensor-client": {"service_id": 24577, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+}
+_IA_JS_REQUIRED = {
+    "math-client": {"service_id": 4097, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+    "string-client": {"service_id": 8193, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
+    "diag-client": {"service_id": 20481, "instance_id": 1, "major_version": 1, "find_on": ["primary"], "protocol": "tcp"},
+    "math-client-tcp": {"service_id": 4097, "instance_id": 3, "major_version": 2, "find_on": ["primary"], "protocol": "tcp"},
+}
+
+# Automotive PubSub (the ADAS fusion client is also used by Integrated Apps)
+_AP_RADAR_PROVIDING = {
+    "radar-service": {
+        "service_id": 28673, "instance_id": 1, "major_version": 1, "minor_version": 0,
+        "offer_on": {"primary": "radar_ep"},
+        "eventgroups": {
+            "radar-events": {
+                "eventgroup_id": 1, "events": [32769], "multicast": {"primary": "event_mcast"}
+            }
+        }
+    }
+}
+_AP_FUSION_PROVIDING = {
+    "fusion-service": {
+        "service_id": 28674, "instance_id": 1, "major_version": 1, "minor_version": 0,
+        "offer_on": {"primary": "fusion_ep"},
+        "eventgroups": {
+            "fusion-events": {
+                "eventgroup_id": 1, "events": [32769], "multicast": {"primary": "event_mcast"}
+            }
+        }
+    }
+}
+_AP_FUSION_REQUIRED = {
+    "radar-client": {"service_id": 28673, "instance_id": 1, "major_version": 1, "find_on": ["primary"]}
+}
+_AP_ADAS_REQUIRED = {
+    "fusion-client": {"service_id": 28674, "instance_id": 1, "major_version": 1, "find_on": ["primary"]}
+}
+
+# Complete "instances" blocks of the distributed (one ECU per namespace)
+# configs, in the shape ConfigGenerator.add_instance() builds.
+_IA_ECU_INSTANCES = {
+    "ecu1": {
+        "rust_app_instance": {
+            "unicast_bind": _PRIMARY_SD_UC_BIND, "providing": _IA_RUST_PROVIDING,
+            "required": _IA_RUST_REQUIRED, "sd": _OFFER_1S_SD,
+        },
+    },
+    "ecu2": {
+        "cpp_app_instance": {
+            "unicast_bind": _PRIMARY_SD_UC_BIND, "providing": _IA_CPP_PROVIDING,
+            "required": _IA_CPP_REQUIRED,
+        },
+    },
+    "ecu3": {
+        "python_app_instance": {
+            "unicast_bind": _PRIMARY_SD_UC_BIND, "providing": _IA_PYTHON_PROVIDING,
+            "required": _IA_PYTHON_REQUIRED,
+        },
+        "adas_python_instance": {"unicast_bind": _PRIMARY_SD_UC_BIND, "required": _AP_ADAS_REQUIRED},
+        "js_app_instance": {"unicast_bind": _PRIMARY_SD_UC_BIND, "required": _IA_JS_REQUIRED},
+    },
+}
+# Every automotive ECU knows all three instances but binds and offers only its own
+_AP_ECU_INSTANCES = {
+    name: {
+        "radar_cpp_instance": {
+            **({"unicast_bind": _PRIMARY_SD_UC_BIND, "providing": _AP_RADAR_PROVIDING} if name == "ecu1" else {}),
+            "sd": _OFFER_1S_SD,
+        },
+        "fusion_rust_instance": {
+            **({"unicast_bind": _PRIMARY_SD_UC_BIND, "providing": _AP_FUSION_PROVIDING} if name == "ecu2" else {}),
+            "required": _AP_FUSION_REQUIRED, "sd": _OFFER_1S_SD,
+        },
+        "adas_python_instance": {
+            **({"unicast_bind": _PRIMARY_SD_UC_BIND} if name == "ecu3" else {}),
+            "required": _AP_ADAS_REQUIRED,
+        },
+    }
+    for name in ("ecu1", "ecu2", "ecu3")
+}
+# Single-host configs carry every instance, each bound and offering
+_IA_SINGLE_INSTANCES = {
+    "rust_app_instance": _IA_ECU_INSTANCES["ecu1"]["rust_app_instance"],
+    "python_app_instance": _IA_ECU_INSTANCES["ecu3"]["python_app_instance"],
+    "cpp_app_instance": _IA_ECU_INSTANCES["ecu2"]["cpp_app_instance"],
+    "js_app_instance": _IA_ECU_INSTANCES["ecu3"]["js_app_instance"],
+}
+_AP_SINGLE_INSTANCES = {
+    "radar_cpp_instance": _AP_ECU_INSTANCES["ecu1"]["radar_cpp_instance"],
+    "fusion_rust_instance": _AP_ECU_INSTANCES["ecu2"]["fusion_rust_instance"],
+    "adas_python_instance": _AP_ECU_INSTANCES["ecu3"]["adas_python_instance"],
+}
+
+# someipy interop demo
+_SOMEIPY_PROVIDING = {
+    "someipy_svc": {"service_id": 0x1234, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "python_service_udp"}}
+}
+_SOMEIPY_REQUIRED = {
+    "someipy_svc": {"service_id": 0x1234, "instance_id": 1, "major_version": 1, "find_on": ["primary"]}
+}
+# The someipy demo runs every instance with a 5s SD request timeout
+_SOMEIPY_SERVICE_INSTANCES = {
+    "PythonService": {
+        "unicast_bind": _PRIMARY_SD_UC_BIND, "providing": _SOMEIPY_PROVIDING,
+        "sd": {"request_timeout_ms": 5000, "cycle_offer_ms": 1000},
+    },
+}
+_SOMEIPY_CLIENT_INSTANCES = {
+    f"{client}_client": {
+        "unicast_bind": _PRIMARY_SD_UC_BIND, "required": _SOMEIPY_REQUIRED,
+        "sd": {"request_timeout_ms": 5000},
+    }
+    for client in ("python", "cpp", "rust", "js")
+}
+
+# Large payload (TP) test
+_TP_PROVIDING = {
+    "tp_service": {
+        "service_id": 20480, "instance_id": 1, "major_version": 1, "minor_version": 0,
+        "offer_on": {"primary": "tp_endpoint"}
+    }
+}
+_TP_REQUIRED = {
+    "tp_service": {
+        "service_id": 20480, "instance_id": 1, "major_version": 1, "minor_version": 0,
+        "find_on": ["primary"]
+    }
+}
+_TP_INSTANCES = {
+    "server": {"tp_server": {"unicast_bind": _PRIMARY_SD_UC_BIND, "providing": _TP_PROVIDING, "sd": _OFFER_1S_SD}},
+    "client": {"tp_client": {"unicast_bind": _PRIMARY_SD_UC_BIND, "required": _TP_REQUIRED}},
+}
+
 
 class SmartConfigFactory:
     """
@@ -117,6 +340,16 @@ class SmartConfigFactory:
     # Event multicast for pub/sub demos
     EVENT_MCAST_V4 = "225.0.0.3"
     EVENT_MCAST_V4_PORT = 30895
+
+    # Endpoint shapes copied by _make_endpoint; never handed out directly
+    _V4_UDP = {"ip": None, "port": 0, "protocol": "udp", "version": 4}
+    _V4_TCP = {"ip": None, "port": 0, "protocol": "tcp", "version": 4}
+    _V6_UDP = {"ip": None, "port": 0, "protocol": "udp", "version": 6}
+    _V6_TCP = {"ip": None, "port": 0, "protocol": "tcp", "version": 6}
+
+    # SD multicast endpoints are the same in every config, so they are shared
+    _SD_MCAST_V4_EP = {"ip": SD_MCAST_V4, "port": SD_MCAST_V4_PORT, "version": 4, "protocol": "udp"}
+    _SD_MCAST_V6_EP = {"ip": SD_MCAST_V6, "port": SD_MCAST_V6_PORT, "version": 6, "protocol": "udp"}
     
     def __init__(self, env):
         """
@@ -124,6 +357,11 @@ class SmartConfigFactory:
             env: NetworkEnvironment instance (must have detect() called already)
         """
         self.env = env
+        # The environment does not change after detect(), so interface
+        # resolution is done once per key. Cached dicts are shared: read-only.
+        self._iface_cache = {}
+        self._vnet_iface_cache = {}
+        self._include_v6 = None
     
     def _resolve_interface(self, ns=None):
         """
@@ -135,6 +373,24 @@ class SmartConfigFactory:
         Returns:
             dict: { "name": str, "ipv4": str|None, "ipv6": str|None }
         """
+        iface = self._iface_cache.get(ns)
+        if iface is None:
+            iface = self._iface_cache[ns] = self._lookup_interface(ns)
+        return iface
+
+    def _has_vnet_ecus(self, *namespaces):
+        """True if VNet is up and every namespace's veth0 has an IPv4 address.
+
+        Reads the topology directly, so probing does not resolve (and cache)
+        interfaces that a non-distributed config never uses.
+        """
+        if not self.env.has_vnet:
+            return False
+        topo = self.env.vnet_topology
+        return all(topo.get(ns, {}).get('veth0', {}).get('ipv4') for ns in namespaces)
+
+    def _lookup_interface(self, ns):
+        """Uncached body of _resolve_interface."""
         if ns and self.env.has_vnet:
             # Use VNet namespace interface
             ns_topo = self.env.vnet_topology.get(ns, {})
@@ -195,13 +451,17 @@ class SmartConfigFactory:
         Returns:
             dict: { "name": str, "ipv4": str|None, "ipv6": str|None }
         """
-        ns_topo = self.env.vnet_topology.get(ns, {})
-        iface_data = ns_topo.get(iface_name, {})
-        return {
-            "name": iface_name,
-            "ipv4": iface_data.get("ipv4"),
-            "ipv6": iface_data.get("ipv6"),
-        }
+        key = (ns, iface_name)
+        iface = self._vnet_iface_cache.get(key)
+        if iface is None:
+            ns_topo = self.env.vnet_topology.get(ns, {})
+            iface_data = ns_topo.get(iface_name, {})
+            iface = self._vnet_iface_cache[key] = {
+                "name": iface_name,
+                "ipv4": iface_data.get("ipv4"),
+                "ipv6": iface_data.get("ipv6"),
+            }
+        return iface
     
     def _make_sd_config(self, include_v6=False):
         """Build the SD section for an interface."""
@@ -214,33 +474,51 @@ class SmartConfigFactory:
         """
         Generate SD multicast + unicast endpoints.
         
+        The unicast entries are fresh and may be edited (e.g. their port);
+        the multicast entries are shared class-level dicts.
+        
         Returns:
             dict: Endpoint definitions for SD
         """
         eps = {
-            "sd_mcast_v4": {"ip": self.SD_MCAST_V4, "port": self.SD_MCAST_V4_PORT, "version": 4, "protocol": "udp"},
+            "sd_mcast_v4": self._SD_MCAST_V4_EP,
             "sd_uc_v4": {"ip": bind_ipv4, "port": 0, "version": 4, "protocol": "udp"},
         }
         if bind_ipv6:
-            eps["sd_mcast_v6"] = {"ip": self.SD_MCAST_V6, "port": self.SD_MCAST_V6_PORT, "version": 6, "protocol": "udp"}
+            eps["sd_mcast_v6"] = self._SD_MCAST_V6_EP
             eps["sd_uc_v6"] = {"ip": bind_ipv6, "port": 0, "version": 6, "protocol": "udp"}
         return eps
     
     def _should_include_ipv6(self):
         """Determine if IPv6 endpoints should be generated."""
-        if self.env.has_vnet and self.env.vnet_has_ipv6:
-            return True
-        return self.env.has_ipv6
+        if self._include_v6 is None:
+            self._include_v6 = bool(self.env.has_vnet and self.env.vnet_has_ipv6) or self.env.has_ipv6
+        return self._include_v6
     
-    def _make_endpoint(self, ip, port=0, protocol="udp"):
-        """Create a single endpoint definition."""
-        return {
-            "ip": ip,
-            "port": port,
-            "protocol": protocol,
-            "version": 6 if ":" in ip else 4,
-        }
+    def _make_endpoint(self, ip, port=0, protocol="udp", version=4):
+        """Create a single endpoint definition.
+
+        Callers know statically which family they pass, so IPv6 endpoints
+        set version=6 instead of the address being scanned for ':'.
+        """
+        v6 = version == 6
+        if protocol == "udp":
+            tpl = self._V6_UDP if v6 else self._V4_UDP
+        elif protocol == "tcp":
+            tpl = self._V6_TCP if v6 else self._V4_TCP
+        else:
+            return {"ip": ip, "port": port, "protocol": protocol, "version": version}
+        # dict(tpl, ...) copies and updates in C, keeping the template's key order
+        return dict(tpl, ip=ip) if port == 0 else dict(tpl, ip=ip, port=port)
     
+    @staticmethod
+    def _primary_config(iface_name, endpoints, sd, instances):
+        """Wrap a finished config whose only interface is the "primary" every demo binds to."""
+        return ConfigGenerator.from_dict({
+            "interfaces": {"primary": {"name": iface_name, "endpoints": endpoints, "sd": sd}},
+            "instances": instances,
+        })
+
     # ─────────────────────────────────────────────────────────
     #  Standard Config Generators
     # ─────────────────────────────────────────────────────────
@@ -255,127 +533,64 @@ class SmartConfigFactory:
         - Non-VNet: Single interface (primary).
           Returns: config_path (str)
         """
-        gen = ConfigGenerator()
+        os.makedirs(output_dir, exist_ok=True)
         include_v6 = self._should_include_ipv6()
         
         # Check if we can do a distributed VNet setup
-        dist_vnet = False
-        if self.env.has_vnet:
-            # Check availability of required namespaces
-            ecu1 = self._resolve_interface('ns_ecu1')
-            ecu2 = self._resolve_interface('ns_ecu2')
-            ecu3 = self._resolve_interface('ns_ecu3')
-            
-            if ecu1['ipv4'] and ecu2['ipv4'] and ecu3['ipv4']:
-                dist_vnet = True
+        dist_vnet = self._has_vnet_ecus('ns_ecu1', 'ns_ecu2', 'ns_ecu3')
                 
         if dist_vnet:
             # --- Distributed VNet Configuration (Split Configs) ---
+            ecu1 = self._resolve_interface('ns_ecu1')
+            ecu2 = self._resolve_interface('ns_ecu2')
+            ecu3 = self._resolve_interface('ns_ecu3')
             
             # Rules: We use logical name "primary" for the main interface in EVERY config.
             # This ensures demo apps can hardcode "primary" and work everywhere.
             
             # --- ECU1 (Rust) ---
-            gen1 = ConfigGenerator()
-            ep1 = {}
-            ep1.update(self._make_sd_endpoints(ecu1['ipv4'], ecu1.get('ipv6') if include_v6 else None))
-            if "sd_uc_v4" in ep1: ep1["sd_uc_v4"]["port"] = 30490
-            # Rust endpoints
-            ep1["rust_udp"] = self._make_endpoint(ecu1['ipv4'], 0, "udp")
-            ep1["rust_tcp"] = self._make_endpoint(ecu1['ipv4'], 0, "tcp")
-            
-            gen1.add_interface("primary", ecu1["name"], endpoints=ep1, sd=self._make_sd_config(include_v6=bool(ecu1.get('ipv6') if include_v6 else None)))
-            
-            gen1.add_instance("rust_app_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "math-service": {"service_id": 4097, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "rust_udp"}},
-                    "eco-service": {"service_id": 4098, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "rust_tcp"}},
-                    "complex-service": {"service_id": 16385, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "rust_udp"}},
-                },
-                required={
-                    "math-client-v2": {"service_id": 4097, "instance_id": 3, "major_version": 2, "find_on": ["primary"]},
-                    "math-client-v1-inst2": {"service_id": 4097, "instance_id": 2, "major_version": 1, "find_on": ["primary"]},
-                    "sort-client": {"service_id": 12289, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "diag-client": {"service_id": 20481, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "string-client": {"service_id": 8193, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                },
-                sd={"cycle_offer_ms": 1000}
-            )
-            gen1.save(os.path.join(output_dir, "config_ecu1.json"))
+            v6_1 = ecu1.get('ipv6') if include_v6 else None
+            ep1 = {
+                **self._make_sd_endpoints(ecu1['ipv4'], v6_1),
+                # Rust endpoints
+                "rust_udp": self._make_endpoint(ecu1['ipv4'], 0, "udp"),
+                "rust_tcp": self._make_endpoint(ecu1['ipv4'], 0, "tcp"),
+            }
+            ep1["sd_uc_v4"]["port"] = 30490
+            
+            gen1 = self._primary_config(ecu1["name"], ep1, self._make_sd_config(include_v6=bool(v6_1)), _IA_ECU_INSTANCES["ecu1"])
             
             # --- ECU2 (C++) ---
-            gen2 = ConfigGenerator()
-            ep2 = {}
-            ep2.update(self._make_sd_endpoints(ecu2['ipv4'], ecu2.get('ipv6') if include_v6 else None))
-            if "sd_uc_v4" in ep2: ep2["sd_uc_v4"]["port"] = 30490
-            # C++ endpoints
-            ep2["cpp_udp"] = self._make_endpoint(ecu2['ipv4'], 0, "udp")
-            
-            gen2.add_interface("primary", ecu2["name"], endpoints=ep2, sd=self._make_sd_config(include_v6=bool(ecu2.get('ipv6') if include_v6 else None)))
-            
-            gen2.add_instance("cpp_app_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "sort-service": {"service_id": 12289, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "cpp_udp"}},
-                    "sensor-service": {"service_id": 24577, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "cpp_udp"}},
-                    "math-service": {"service_id": 4097, "instance_id": 2, "major_version": 1, "offer_on": {"primary": "cpp_udp"}},
-                },
-                required={
-                    "math-client": {"service_id": 4097, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "string-client": {"service_id": 8193, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                }
-            )
-            gen2.save(os.path.join(output_dir, "config_ecu2.json"))
+            v6_2 = ecu2.get('ipv6') if include_v6 else None
+            ep2 = {
+                **self._make_sd_endpoints(ecu2['ipv4'], v6_2),
+                # C++ endpoints
+                "cpp_udp": self._make_endpoint(ecu2['ipv4'], 0, "udp"),
+            }
+            ep2["sd_uc_v4"]["port"] = 30490
             
-            # --- ECU3 (Python) ---
-            gen3 = ConfigGenerator()
-            ep3 = {}
-            ep3.update(self._make_sd_endpoints(ecu3['ipv4'], ecu3.get('ipv6') if include_v6 else None))
-            if "sd_uc_v4" in ep3: ep3["sd_uc_v4"]["port"] = 30490
-            # Python endpoints
-            ep3["python_v4_udp"] = self._make_endpoint(ecu3['ipv4'], 0, "udp")
-            ep3["python_v4_tcp"] = self._make_endpoint(ecu3['ipv4'], 0, "tcp")
-            if include_v6 and ecu3.get('ipv6'):
-                ep3["python_v6_udp"] = self._make_endpoint(ecu3['ipv6'], 0, "udp")
-                ep3["python_v6_tcp"] = self._make_endpoint(ecu3['ipv6'], 0, "tcp")
-
-            gen3.add_interface("primary", ecu3["name"], endpoints=ep3, sd=self._make_sd_config(include_v6=bool(ecu3.get('ipv6') if include_v6 else None)))
-            
-            gen3.add_instance("python_app_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "string-service": {"service_id": 8193, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "python_v4_udp"}},
-                    "diagnostic-service": {"service_id": 20481, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "python_v4_tcp"}},
-                    "math-service": {"service_id": 4097, "instance_id": 3, "major_version": 2, "offer_on": {"primary": "python_v4_tcp"}},
-                },
-                required={
-                    "math-client": {"service_id": 4097, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "eco-client": {"service_id": 4098, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "complex-client": {"service_id": 16385, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "sort-client": {"service_id": 12289, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "sensor-client": {"service_id": 24577, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                }
-            )
+            gen2 = self._primary_config(ecu2["name"], ep2, self._make_sd_config(include_v6=bool(v6_2)), _IA_ECU_INSTANCES["ecu2"])
             
-            gen3.add_instance("adas_python_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                required={
-                    "fusion-client": {"service_id": 28674, "instance_id": 1, "major_version": 1, "find_on": ["primary"]}
-                }
-            )
-            
-            gen3.add_instance("js_app_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                required={
-                    "math-client": {"service_id": 4097, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "string-client": {"service_id": 8193, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "diag-client": {"service_id": 20481, "instance_id": 1, "major_version": 1, "find_on": ["primary"], "protocol": "tcp"},
-                    "math-client-tcp": {"service_id": 4097, "instance_id": 3, "major_version": 2, "find_on": ["primary"], "protocol": "tcp"},
-                }
-            )
+            # --- ECU3 (Python) ---
+            v6_3 = ecu3.get('ipv6') if include_v6 else None
+            ep3 = {
+                **self._make_sd_endpoints(ecu3['ipv4'], v6_3),
+                # Python endpoints
+                "python_v4_udp": self._make_endpoint(ecu3['ipv4'], 0, "udp"),
+                "python_v4_tcp": self._make_endpoint(ecu3['ipv4'], 0, "tcp"),
+            }
+            ep3["sd_uc_v4"]["port"] = 30490
+            if v6_3:
+                ep3["python_v6_udp"] = self._make_endpoint(ecu3['ipv6'], 0, "udp", version=6)
+                ep3["python_v6_tcp"] = self._make_endpoint(ecu3['ipv6'], 0, "tcp", version=6)
+
+            gen3 = self._primary_config(ecu3["name"], ep3, self._make_sd_config(include_v6=bool(v6_3)), _IA_ECU_INSTANCES["ecu3"])
             
-            gen3.save(os.path.join(output_dir, "config_ecu3.json"))
+            _save_all([
+                (gen1, os.path.join(output_dir, "config_ecu1.json")),
+                (gen2, os.path.join(output_dir, "config_ecu2.json")),
+                (gen3, os.path.join(output_dir, "config_ecu3.json")),
+            ])
             logger.info("Generated distributed configs (ecu1,ecu2,ecu3) in " + output_dir)
             return output_dir
 
@@ -400,70 +615,13 @@ class SmartConfigFactory:
             
             # IPv6 service endpoints (when available)
             if ipv6:
-                endpoints["python_v6_tcp"] = self._make_endpoint(ipv6, 0, "tcp")
-            
-            sd = self._make_sd_config(include_v6=bool(ipv6))
-            gen.add_interface("primary", iface["name"], endpoints=endpoints, sd=sd)
+                endpoints["python_v6_tcp"] = self._make_endpoint(ipv6, 0, "tcp", version=6)
             
             # Instances — service topology mirrors the demo architecture
-            gen.add_instance("rust_app_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "math-service": {"service_id": 4097, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "rust_udp"}},
-                    "eco-service": {"service_id": 4098, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "rust_tcp"}},
-                    "complex-service": {"service_id": 16385, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "rust_udp"}},
-                },
-                required={
-                    "math-client-v2": {"service_id": 4097, "instance_id": 3, "major_version": 2, "find_on": ["primary"]},
-                    "math-client-v1-inst2": {"service_id": 4097, "instance_id": 2, "major_version": 1, "find_on": ["primary"]},
-                    "sort-client": {"service_id": 12289, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "diag-client": {"service_id": 20481, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "string-client": {"service_id": 8193, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                },
-                sd={"cycle_offer_ms": 1000}
-            )
-            
-            gen.add_instance("python_app_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "string-service": {"service_id": 8193, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "python_v4_udp"}},
-                    "diagnostic-service": {"service_id": 20481, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "python_v4_tcp"}},
-                    "math-service": {"service_id": 4097, "instance_id": 3, "major_version": 2, "offer_on": {"primary": "python_v4_tcp"}},
-                },
-                required={
-                    "math-client": {"service_id": 4097, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "eco-client": {"service_id": 4098, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "complex-client": {"service_id": 16385, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "sort-client": {"service_id": 12289, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "sensor-client": {"service_id": 24577, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                }
-            )
-            
-            gen.add_instance("cpp_app_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "sort-service": {"service_id": 12289, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "cpp_udp"}},
-                    "sensor-service": {"service_id": 24577, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "cpp_udp"}},
-                    "math-service": {"service_id": 4097, "instance_id": 2, "major_version": 1, "offer_on": {"primary": "cpp_udp"}},
-                },
-                required={
-                    "math-client": {"service_id": 4097, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "string-client": {"service_id": 8193, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                }
-            )
-            
-            gen.add_instance("js_app_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                required={
-                    "math-client": {"service_id": 4097, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "string-client": {"service_id": 8193, "instance_id": 1, "major_version": 1, "find_on": ["primary"]},
-                    "diag-client": {"service_id": 20481, "instance_id": 1, "major_version": 1, "find_on": ["primary"], "protocol": "tcp"},
-                    "math-client-tcp": {"service_id": 4097, "instance_id": 3, "major_version": 2, "find_on": ["primary"], "protocol": "tcp"},
-                }
-            )
+            gen = self._primary_config(iface["name"], endpoints, self._make_sd_config(include_v6=bool(ipv6)), _IA_SINGLE_INSTANCES)
         
         config_path = os.path.join(output_dir, "config.json")
-        gen.save(config_path)
+        gen.save(config_path, ensure_dir=False)
         logger.info(f"Generated integrated_apps config: {config_path} (iface={iface['name']}, ipv4={ipv4}, ipv6={ipv6})")
         return config_path
 
@@ -479,16 +637,11 @@ class SmartConfigFactory:
             - ADAS on ns_ecu3 -> config_ecu3.json
         - Non-VNet: Single config for all nodes.
         """
+        os.makedirs(output_dir, exist_ok=True)
         include_v6 = self._should_include_ipv6()
         
         # Check for distributed VNet capability (Require 3 ECUs)
-        dist_vnet = False
-        if self.env.has_vnet:
-            ecu1 = self._resolve_interface('ns_ecu1')
-            ecu2 = self._resolve_interface('ns_ecu2')
-            ecu3 = self._resolve_interface('ns_ecu3')
-            if ecu1['ipv4'] and ecu2['ipv4'] and ecu3['ipv4']:
-                dist_vnet = True
+        dist_vnet = self._has_vnet_ecus('ns_ecu1', 'ns_ecu2', 'ns_ecu3')
         
         if dist_vnet:
             # --- Distributed Configuration (Split Configs) ---
@@ -498,10 +651,10 @@ class SmartConfigFactory:
                 'ecu3': self._resolve_interface('ns_ecu3')
             }
             
+            jobs = []
             for name, iface in ecus.items():
                 ipv4 = iface["ipv4"]
                 ipv6 = iface.get("ipv6") if include_v6 else None
-                gen = ConfigGenerator()
                 
                 endpoints = {
                     "sd_mcast_v4": {"ip": self.SD_MCAST_V4, "port": 30892, "version": 4, "protocol": "udp"},
@@ -522,63 +675,13 @@ class SmartConfigFactory:
                 if include_v6:
                     sd["endpoint_v6"] = "sd_mcast_v6"
                 
-                gen.add_interface("primary", iface["name"], endpoints=endpoints, sd=sd)
-                
                 # Add all instances to all configs (they only run their own)
                 # But they need the knowledge of other instances for 'required' blocks
-                # Add instance-specific providers only if the endpoint is local
-                radar_providing = None
-                if name == 'ecu1':
-                    radar_providing = {
-                        "radar-service": {
-                            "service_id": 28673, "instance_id": 1, "major_version": 1, "minor_version": 0,
-                            "offer_on": {"primary": "radar_ep"},
-                            "eventgroups": {
-                                "radar-events": {
-                                    "eventgroup_id": 1, "events": [32769], "multicast": {"primary": "event_mcast"}
-                                }
-                            }
-                        }
-                    }
-
-                gen.add_instance("radar_cpp_instance",
-                    unicast_bind={"primary": "sd_uc_v4"} if name == 'ecu1' else None,
-                    providing=radar_providing,
-                    sd={"cycle_offer_ms": 1000}
-                )
+                gen = self._primary_config(iface["name"], endpoints, sd, _AP_ECU_INSTANCES[name])
                 
-                fusion_providing = None
-                if name == 'ecu2':
-                    fusion_providing = {
-                        "fusion-service": {
-                            "service_id": 28674, "instance_id": 1, "major_version": 1, "minor_version": 0,
-                            "offer_on": {"primary": "fusion_ep"},
-                            "eventgroups": {
-                                "fusion-events": {
-                                    "eventgroup_id": 1, "events": [32769], "multicast": {"primary": "event_mcast"}
-                                }
-                            }
-                        }
-                    }
-
-                gen.add_instance("fusion_rust_instance",
-                    unicast_bind={"primary": "sd_uc_v4"} if name == 'ecu2' else None,
-                    providing=fusion_providing,
-                    required={
-                        "radar-client": {"service_id": 28673, "instance_id": 1, "major_version": 1, "find_on": ["primary"]}
-                    },
-                    sd={"cycle_offer_ms": 1000}
-                )
-                
-                gen.add_instance("adas_python_instance",
-                    unicast_bind={"primary": "sd_uc_v4"} if name == 'ecu3' else None,
-                    required={
-                        "fusion-client": {"service_id": 28674, "instance_id": 1, "major_version": 1, "find_on": ["primary"]}
-                    }
-                )
-                
-                gen.save(os.path.join(output_dir, f"config_{name}.json"))
+                jobs.append((gen, os.path.join(output_dir, f"config_{name}.json")))
             
+            _save_all(jobs)
             logger.info(f"Generated split automotive_pubsub configs in {output_dir}")
             return output_dir
         else:
@@ -587,8 +690,6 @@ class SmartConfigFactory:
             ipv4 = iface["ipv4"] or "127.0.0.1"
             ipv6 = iface.get("ipv6") if include_v6 else None
             
-            gen = ConfigGenerator()
-            
             endpoints = {
                 "sd_mcast_v4": {"ip": self.SD_MCAST_V4, "port": 30892, "version": 4, "protocol": "udp"},
                 "event_mcast": {"ip": self.EVENT_MCAST_V4, "port": self.EVENT_MCAST_V4_PORT, "version": 4, "protocol": "udp"},
@@ -604,52 +705,10 @@ class SmartConfigFactory:
             if ipv6:
                 sd["endpoint_v6"] = "sd_mcast_v6"
             
-            gen.add_interface("primary", iface["name"], endpoints=endpoints, sd=sd)
-            
-            gen.add_instance("radar_cpp_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "radar-service": {
-                        "service_id": 28673, "instance_id": 1, "major_version": 1, "minor_version": 0,
-                        "offer_on": {"primary": "radar_ep"},
-                        "eventgroups": {
-                            "radar-events": {
-                                "eventgroup_id": 1, "events": [32769], "multicast": {"primary": "event_mcast"}
-                            }
-                        }
-                    }
-                },
-                sd={"cycle_offer_ms": 1000}
-            )
-            
-            gen.add_instance("fusion_rust_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "fusion-service": {
-                        "service_id": 28674, "instance_id": 1, "major_version": 1, "minor_version": 0,
-                        "offer_on": {"primary": "fusion_ep"},
-                        "eventgroups": {
-                            "fusion-events": {
-                                "eventgroup_id": 1, "events": [32769], "multicast": {"primary": "event_mcast"}
-                            }
-                        }
-                    }
-                },
-                required={
-                    "radar-client": {"service_id": 28673, "instance_id": 1, "major_version": 1, "find_on": ["primary"]}
-                },
-                sd={"cycle_offer_ms": 1000}
-            )
-            
-            gen.add_instance("adas_python_instance",
-                unicast_bind={"primary": "sd_uc_v4"},
-                required={
-                    "fusion-client": {"service_id": 28674, "instance_id": 1, "major_version": 1, "find_on": ["primary"]}
-                }
-            )
+            gen = self._primary_config(iface["name"], endpoints, sd, _AP_SINGLE_INSTANCES)
             
             config_path = os.path.join(output_dir, "config.json")
-            gen.save(config_path)
+            gen.save(config_path, ensure_dir=False)
             logger.info(f"Generated single automotive_pubsub config: {config_path} (iface={iface['name']}, ipv4={ipv4})")
             return config_path
 
@@ -666,66 +725,49 @@ class SmartConfigFactory:
         - Non-VNet: Single interface (primary/loopback) -> client_config.json
             Returns: config_path
         """
-        gen = ConfigGenerator().set_sd(request_timeout_ms=5000)
+        os.makedirs(output_dir, exist_ok=True)
         include_v6 = self._should_include_ipv6()
 
         # Check for distributed VNet capability
-        dist_vnet = False
-        if self.env.has_vnet:
-            ecu1 = self._resolve_interface('ns_ecu1')
-            ecu3 = self._resolve_interface('ns_ecu3')
-            if ecu1['ipv4'] and ecu3['ipv4']:
-                dist_vnet = True
+        dist_vnet = self._has_vnet_ecus('ns_ecu1', 'ns_ecu3')
         
         if dist_vnet:
             # --- Distributed Configuration (Split Configs) ---
+            ecu1 = self._resolve_interface('ns_ecu1')
+            ecu3 = self._resolve_interface('ns_ecu3')
             
             # 1. Interface ECU1 (Service)
-            gen1 = ConfigGenerator().set_sd(request_timeout_ms=5000)
-            ep1 = {}
-            ep1.update(self._make_sd_endpoints(ecu1['ipv4'], ecu1.get('ipv6') if include_v6 else None))
-            if "sd_uc_v4" in ep1: ep1["sd_uc_v4"]["port"] = 30490
-            
-            # Service endpoint
-            ep1["python_service_udp"] = self._make_endpoint(ecu1['ipv4'], 0, "udp")
-            ep1["python_service_tcp"] = self._make_endpoint(ecu1['ipv4'], 0, "tcp")
+            v6_1 = ecu1.get('ipv6') if include_v6 else None
+            ep1 = {
+                **self._make_sd_endpoints(ecu1['ipv4'], v6_1),
+                # Service endpoint
+                "python_service_udp": self._make_endpoint(ecu1['ipv4'], 0, "udp"),
+                "python_service_tcp": self._make_endpoint(ecu1['ipv4'], 0, "tcp"),
+            }
+            ep1["sd_uc_v4"]["port"] = 30490
             
-            gen1.add_interface("primary", ecu1["name"], endpoints=ep1, sd=self._make_sd_config(include_v6=bool(ecu1.get('ipv6') if include_v6 else None)))
+            # Python Service
+            gen1 = self._primary_config(ecu1["name"], ep1, self._make_sd_config(include_v6=bool(v6_1)), _SOMEIPY_SERVICE_INSTANCES)
 
             # 2. Interface ECU3 (Clients)
-            gen3 = ConfigGenerator().set_sd(request_timeout_ms=5000)
-            ep3 = {}
-            ep3.update(self._make_sd_endpoints(ecu3['ipv4'], ecu3.get('ipv6') if include_v6 else None))
-            if "sd_uc_v4" in ep3: ep3["sd_uc_v4"]["port"] = 30490
-
-            # Client endpoints
-            ep3["python_client_ep"] = self._make_endpoint(ecu3['ipv4'], 0, "udp")
-            ep3["cpp_client_ep"] = self._make_endpoint(ecu3['ipv4'], 0, "udp")
-            ep3["rust_client_ep"] = self._make_endpoint(ecu3['ipv4'], 0, "udp")
-            ep3["js_client_ep"] = self._make_endpoint(ecu3['ipv4'], 0, "udp")
-
-            gen3.add_interface("primary", ecu3["name"], endpoints=ep3, sd=self._make_sd_config(include_v6=bool(ecu3.get('ipv6') if include_v6 else None)))
-
-            # 3. Instances
-            # Python Service (ECU1)
-            gen1.add_instance("PythonService",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "someipy_svc": {"service_id": 0x1234, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "python_service_udp"}}
-                },
-                sd={"cycle_offer_ms": 1000}
-            )
-            gen1.save(os.path.join(output_dir, "config_ecu1.json"))
-
-            # Clients (ECU3)
-            for client in ["python", "cpp", "rust", "js"]:
-                gen3.add_instance(f"{client}_client",
-                    unicast_bind={"primary": "sd_uc_v4"},
-                    required={
-                        "someipy_svc": {"service_id": 0x1234, "instance_id": 1, "major_version": 1, "find_on": ["primary"]}
-                    }
-                )
-            gen3.save(os.path.join(output_dir, "config_ecu3.json"))
+            v6_3 = ecu3.get('ipv6') if include_v6 else None
+            ep3 = {
+                **self._make_sd_endpoints(ecu3['ipv4'], v6_3),
+                # Client endpoints
+                "python_client_ep": self._make_endpoint(ecu3['ipv4'], 0, "udp"),
+                "cpp_client_ep": self._make_endpoint(ecu3['ipv4'], 0, "udp"),
+                "rust_client_ep": self._make_endpoint(ecu3['ipv4'], 0, "udp"),
+                "js_client_ep": self._make_endpoint(ecu3['ipv4'], 0, "udp"),
+            }
+            ep3["sd_uc_v4"]["port"] = 30490
+
+            # Python, C++, Rust and JS clients
+            gen3 = self._primary_config(ecu3["name"], ep3, self._make_sd_config(include_v6=bool(v6_3)), _SOMEIPY_CLIENT_INSTANCES)
+
+            _save_all([
+                (gen1, os.path.join(output_dir, "config_ecu1.json")),
+                (gen3, os.path.join(output_dir, "config_ecu3.json")),
+            ])
             
             logger.info("Generated distributed someipy_demo configs in " + output_dir)
             return output_dir
@@ -746,26 +788,11 @@ class SmartConfigFactory:
             }
             endpoints.update(self._make_sd_endpoints(ipv4, ipv6))
 
-            gen.add_interface("primary", iface["name"], endpoints=endpoints, sd=self._make_sd_config(include_v6=bool(ipv6)))
-            
-            gen.add_instance("PythonService",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "someipy_svc": {"service_id": 0x1234, "instance_id": 1, "major_version": 1, "offer_on": {"primary": "python_service_udp"}}
-                },
-                sd={"cycle_offer_ms": 1000}
-            )
-            
-            for client in ["python", "cpp", "rust", "js"]:
-                gen.add_instance(f"{client}_client",
-                    unicast_bind={"primary": "sd_uc_v4"},
-                    required={
-                        "someipy_svc": {"service_id": 0x1234, "instance_id": 1, "major_version": 1, "find_on": ["primary"]}
-                    }
-                )
+            gen = self._primary_config(iface["name"], endpoints, self._make_sd_config(include_v6=bool(ipv6)),
+                                       {**_SOMEIPY_SERVICE_INSTANCES, **_SOMEIPY_CLIENT_INSTANCES})
 
             config_path = os.path.join(output_dir, "client_config.json")
-            gen.save(config_path)
+            gen.save(config_path, ensure_dir=False)
             logger.info(f"Generated someipy_demo config: {config_path}")
             return config_path
     
@@ -799,15 +826,11 @@ class SmartConfigFactory:
         - Non-VNet:
             - Single config for both -> config.json (or separate if needed)
         """
+        os.makedirs(output_dir, exist_ok=True)
         include_v6 = self._should_include_ipv6()
         
         # Check for distributed VNet capability
-        dist_vnet = False
-        if self.env.has_vnet:
-            ecu1 = self._resolve_interface('ns_ecu1')
-            ecu2 = self._resolve_interface('ns_ecu2')
-            if ecu1['ipv4'] and ecu2['ipv4']:
-                dist_vnet = True
+        dist_vnet = self._has_vnet_ecus('ns_ecu1', 'ns_ecu2')
         
         if dist_vnet:
             # --- Distributed Configuration ---
@@ -816,10 +839,10 @@ class SmartConfigFactory:
                 'client': self._resolve_interface('ns_ecu2')
             }
             
+            jobs = []
             for role, iface in ecus.items():
                 ipv4 = iface["ipv4"]
                 ipv6 = iface.get("ipv6") if include_v6 else None
-                gen = ConfigGenerator()
                 
                 # Endpoints
                 # SD Multicast (Standard)
@@ -829,32 +852,10 @@ class SmartConfigFactory:
                 # TP Service Endpoint
                 endpoints["tp_endpoint"] = self._make_endpoint(ipv4, 30500, "udp")
                 
-                gen.add_interface("primary", iface["name"], endpoints=endpoints, sd=self._make_sd_config(include_v6=bool(ipv6)))
-                
-                if role == 'server':
-                    gen.add_instance("tp_server",
-                        unicast_bind={"primary": "sd_uc_v4"},
-                        providing={
-                            "tp_service": {
-                                "service_id": 20480, "instance_id": 1, "major_version": 1, "minor_version": 0,
-                                "offer_on": {"primary": "tp_endpoint"}
-                            }
-                        },
-                        sd={"cycle_offer_ms": 1000}
-                    )
-                else: # client
-                    gen.add_instance("tp_client",
-                        unicast_bind={"primary": "sd_uc_v4"},
-                        required={
-                            "tp_service": {
-                                "service_id": 20480, "instance_id": 1, "major_version": 1, "minor_version": 0,
-                                "find_on": ["primary"]
-                            }
-                        }
-                    )
-                
-                gen.save(os.path.join(output_dir, f"config_{role}.json"))
+                gen = self._primary_config(iface["name"], endpoints, self._make_sd_config(include_v6=bool(ipv6)), _TP_INSTANCES[role])
+                jobs.append((gen, os.path.join(output_dir, f"config_{role}.json")))
                 
+            _save_all(jobs)
             logger.info(f"Generated distributed large_payload configs in {output_dir}")
             return output_dir
 
@@ -865,43 +866,22 @@ class SmartConfigFactory:
             ipv6 = iface.get("ipv6") if include_v6 else None
             
             # 1. Server Config
-            gen1 = ConfigGenerator()
             ep1 = self._make_sd_endpoints(ipv4, ipv6)
             if "sd_uc_v4" in ep1: ep1["sd_uc_v4"]["port"] = 30490 # Server SD Port
             ep1["tp_endpoint"] = self._make_endpoint(ipv4, 30500, "udp")
             
-            gen1.add_interface("primary", iface["name"], endpoints=ep1, sd=self._make_sd_config(include_v6=bool(ipv6)))
-            
-            gen1.add_instance("tp_server",
-                unicast_bind={"primary": "sd_uc_v4"},
-                providing={
-                    "tp_service": {
-                        "service_id": 20480, "instance_id": 1, "major_version": 1, "minor_version": 0,
-                        "offer_on": {"primary": "tp_endpoint"}
-                    }
-                },
-                sd={"cycle_offer_ms": 1000}
-            )
-            gen1.save(os.path.join(output_dir, "config_server.json"))
+            gen1 = self._primary_config(iface["name"], ep1, self._make_sd_config(include_v6=bool(ipv6)), _TP_INSTANCES["server"])
             
             # 2. Client Config
-            gen2 = ConfigGenerator()
             ep2 = self._make_sd_endpoints(ipv4, ipv6)
             # Use DIFFERENT port for Client SD to avoid self-reception on loopback/unicast
             if "sd_uc_v4" in ep2: ep2["sd_uc_v4"]["port"] = 30491 
             
-            gen2.add_interface("primary", iface["name"], endpoints=ep2, sd=self._make_sd_config(include_v6=bool(ipv6)))
-            
-            gen2.add_instance("tp_client",
-                unicast_bind={"primary": "sd_uc_v4"},
-                required={
-                    "tp_service": {
-                        "service_id": 20480, "instance_id": 1, "major_version": 1, "minor_version": 0,
-                        "find_on": ["primary"]
-                    }
-                }
-            )
-            gen2.save(os.path.join(output_dir, "config_client.json"))
+            gen2 = self._primary_config(iface["name"], ep2, self._make_sd_config(include_v6=bool(ipv6)), _TP_INSTANCES["client"])
+            _save_all([
+                (gen1, os.path.join(output_dir, "config_server.json")),
+                (gen2, os.path.join(output_dir, "config_client.json")),
+            ])
             
             logger.info(f"Generated split large_payload configs (single host) in {output_dir}")
             return output_dir
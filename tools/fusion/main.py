@@ -10,6 +10,7 @@ if __name__ == "__main__" and __package__ is None:
     __package__ = "tools.fusion"
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from tools.fusion.toolchains import ToolchainManager
 from tools.fusion.report import Reporter
@@ -101,22 +102,26 @@ def run_build(root_dir, reporter, builder, tool_status, target, server, skip_cod
     reporter.generate_index({"current_step": "Building", "overall_status": "RUNNING", "tools": tool_status})
     print("\n=== Building ===")
     
+    rust = target in ["all", "rust", "python"]
     if not skip_codegen and target in ["all", "rust", "cpp"]:
-        # If running as "build" stage but NOT "all" stage (which handled it), we might need this.
-        if not builder.generate_bindings(): 
-            raise Exception("Bindings Generation Failed")
+        # Crate downloads are network-bound and codegen is CPU-bound; overlap them.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            if rust:
+                pool.submit(builder.fetch_rust)
+            # If running as "build" stage but NOT "all" stage (which handled it), we might need this.
+            if not builder.generate_bindings(): 
+                raise Exception("Bindings Generation Failed")
     
-    if target in ["all", "rust", "python"]:
-        if not builder.build_rust(packet_dump): 
-            raise Exception("Rust Build Failed")
-    
-    if tool_status.get("cmake") and target in ["all", "cpp", "python"]:
-        if not builder.build_cpp(with_coverage, packet_dump):
-            raise Exception("C++ Build Failed")
-
-    if target in ["all", "js", "python"]:
-        if not builder.build_js():
-            raise Exception("JS Build Failed")
+    # Codegen has already run, so the language builds are independent
+    failed = builder.build_all(
+        rust=rust,
+        cpp=bool(tool_status.get("cmake")) and target in ["all", "cpp", "python"],
+        js=target in ["all", "js", "python"],
+        with_coverage=with_coverage,
+        packet_dump=packet_dump,
+    )
+    if failed:
+        raise Exception(f"{failed[0]} Build Failed")
 
     
     # Capture and Validate Initial Configurations
@@ -327,7 +327,7 @@ class Tester:
         })
 
         # 2. Codegen Tests
-        codegen_cmd = [sys.executable, "-m", "unittest", "tools.codegen.tests.test_codegen", "-v"]
+        codegen_cmd = [sys.executable, "-m", "pytest", "tools/codegen/tests", "-v"]
         header_codegen = f"=== FUSION CODEGEN UNIT TEST ===\nCommand: {' '.join(codegen_cmd)}\nPWD: {os.getcwd()}\n================================\n\n"
         
         codegen_log = os.path.join(log_dir, "test_codegen.log")